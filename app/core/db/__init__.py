@@ -5,3 +5,4 @@ from .types import *
 from .relations import *
 from .composite import *
 from .hybrid import *
+from .bulk import *
@@ -0,0 +1,115 @@
+from itertools import count
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import MetaData, Table, Column, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+__all__ = ["CopyLoader"]
+
+
+_staging_ids = count()
+# staging tables are described only to build merge query, they are created by LIKE
+_staging_metadata = MetaData()
+
+
+class CopyLoader:
+    """
+    Loads rows into table by binary COPY (asyncpg copy_records_to_table).
+    Values are prepared column by column: bind processor of every column type (our TypeDecorators included)
+    is looked up once and mapped over the whole column, then columns are zipped into records in table order.
+    With conflict rows are copied into temporary staging table and merged by INSERT ... ON CONFLICT DO UPDATE.
+    """
+
+    def __init__(self, session: AsyncSession, table: Table):
+        self.session = session
+        self.table = table
+        self.dialect = session.bind.dialect if session.bind is not None else postgresql.asyncpg.dialect()
+        self._processors: dict[str, Callable[[Any], Any] | None] = {}
+
+    def columns(self, keys: Iterable[str]) -> list[Column]:
+        """Columns for given keys and columns with python side defaults, which COPY does not apply, in table order"""
+        keys = set(keys)
+        unknown = keys - set(self.table.columns.keys())
+        if unknown:
+            raise ValueError(f'{sorted(unknown)} are not columns of "{self.table.fullname}"')
+        return [col for col in self.table.columns if col.key in keys or self._has_python_default(col)]
+
+    @staticmethod
+    def _has_python_default(col: Column) -> bool:
+        return col.default is not None and (col.default.is_scalar or col.default.is_callable)
+
+    @staticmethod
+    def _default_value(col: Column) -> Any:
+        if col.default.is_scalar:
+            return col.default.arg
+        return col.default.arg(None)
+
+    def processor(self, col: Column) -> Callable[[Any], Any] | None:
+        if col.key not in self._processors:
+            self._processors[col.key] = col.type.bind_processor(self.dialect)
+        return self._processors[col.key]
+
+    def make_records(self, columns: list[Column], rows: list[dict[str, Any]]) -> list[tuple]:
+        processed = []
+        for col in columns:
+            if col.key in rows[0] or not self._has_python_default(col):
+                values = [row.get(col.key) for row in rows]
+            else:
+                values = [row[col.key] if col.key in row else self._default_value(col) for row in rows]
+            processor = self.processor(col)
+            processed.append(values if processor is None else list(map(processor, values)))
+        return list(zip(*processed))
+
+    async def _raw_connection(self):
+        connection = await self.session.connection()
+        return (await connection.get_raw_connection()).driver_connection
+
+    async def copy(self, rows: list[dict[str, Any]], *, conflict: list[str] = None) -> int:
+        """Rows must have the same keys. Returns number of copied rows"""
+        if not rows:
+            return 0
+        columns = self.columns(rows[0])
+        records = self.make_records(columns, rows)
+        names = [col.name for col in columns]
+        raw = await self._raw_connection()
+        if conflict is None:
+            await raw.copy_records_to_table(
+                self.table.name, schema_name=self.table.schema, columns=names, records=records,
+            )
+        else:
+            await self._copy_and_merge(raw, columns, records, conflict)
+        return len(records)
+
+    async def _copy_and_merge(self, raw, columns: list[Column], records: list[tuple], conflict: list[str]) -> None:
+        preparer = self.dialect.identifier_preparer
+        staging = Table(
+            f'_copy_staging_{self.table.name}_{next(_staging_ids)}',
+            _staging_metadata,
+            *(Column(col.name, col.type) for col in columns),
+        )
+        names = ', '.join(preparer.quote(col.name) for col in columns)
+        try:
+            # only copied columns, without constraints of the table
+            await self.session.execute(text(
+                f'CREATE TEMPORARY TABLE {preparer.quote(staging.name)} ON COMMIT DROP AS '
+                f'SELECT {names} FROM {preparer.format_table(self.table)} WITH NO DATA'
+            ))
+            await raw.copy_records_to_table(staging.name, columns=[col.name for col in columns], records=records)
+            query = postgresql.insert(self.table).from_select(
+                [col.name for col in columns],
+                select(*(staging.c[col.name] for col in columns)),
+            )
+            update_keys = [col.name for col in columns if col.name not in conflict]
+            if update_keys:
+                query = query.on_conflict_do_update(
+                    index_elements=conflict,
+                    set_={name: query.excluded[name] for name in update_keys},
+                )
+            else:
+                query = query.on_conflict_do_nothing(index_elements=conflict)
+            await self.session.execute(query)
+        finally:
+            await self.session.execute(text(f'DROP TABLE IF EXISTS {preparer.quote(staging.name)}'))
+            _staging_metadata.remove(staging)
@@ -3,3 +3,4 @@ from ._object import *
 from .directory import *
 from .document import *
 from .list import *
+from .register import *
@@ -12,7 +12,7 @@ class Model(DeclarativeBase):
     __table_args_extra__: dict[str, Any] = None
 
     __SCHEMA__: ClassVar[str]
-    available_namespaces = frozenset(('directories', 'documents'))
+    available_namespaces = frozenset(('directories', 'documents', 'registers'))
     _include_in_schema: bool = True
 
     @declared_attr.directive
@@ -47,7 +47,7 @@ class Model(DeclarativeBase):
         return model
 
     @classmethod
-    def iter_models(cls, namespace: Literal["directories", "documents"] | str = None):
+    def iter_models(cls, namespace: Literal["directories", "documents", "registers"] | str = None):
         if namespace:
             assert namespace in cls.available_namespaces
             return filter(lambda x: x[0][0] == namespace, _models.items())
@@ -18,8 +18,13 @@ class ListModel(Model, Generic[OBJECT, PK]):
 
     __OWNER__: Type[OBJECT]
     __BACK_POPULATES__: ClassVar[str]
+    # step between row numbers. 1 - rows are numbered 1..N, otherwise rows are inserted into gaps between numbers
+    __RN_GAP__: ClassVar[int] = 1
 
-    rn: Mapped[int] = integer(primary_key=True, t='small')
+    @declared_attr
+    @classmethod
+    def rn(cls) -> Mapped[int]:
+        return integer(primary_key=True, t='small' if cls.__RN_GAP__ == 1 else 'normal')
 
     @declared_attr
     @classmethod
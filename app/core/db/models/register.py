@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import ClassVar, Literal, TypeVar
+from uuid import UUID
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped
+
+from ._base import Model
+from .. import types
+
+__all__ = ["AccumulationRegister", "REGISTER"]
+
+
+class AccumulationRegister(Model):
+    """
+    Movements of conducted documents. Subclasses declare dimensions and resources as columns
+    and list their names. Movements of document are identified by recorder_id (id of document).
+
+    If __TOTALS_PERIOD__ is set, register gets two more tables, keyed by period and dimensions:
+    totals - sums of movements by period, maintained on conducting,
+    snapshots - balances at the start of closed periods.
+    """
+    __abstract__ = True
+
+    __SCHEMA__: ClassVar[str] = 'registers'
+    __DIMENSIONS__: ClassVar[tuple[str, ...]] = ()
+    __RESOURCES__: ClassVar[tuple[str, ...]] = ()
+    __TOTALS_PERIOD__: ClassVar[Literal["day", "month", "year"] | None] = 'month'
+
+    __totals__: ClassVar[sa.Table | None] = None
+    __snapshots__: ClassVar[sa.Table | None] = None
+
+    recorder_id: Mapped[UUID] = types.guid(primary_key=True, generated=False)
+    # index of movement declaration in document repository
+    movement: Mapped[int] = types.integer(primary_key=True, t='small')
+    # rn of list row, 0 for movements of document itself
+    line_no: Mapped[int] = types.integer(primary_key=True)
+    period: Mapped[datetime] = types.datetime()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.__dict__.get('__abstract__', False):
+            return
+        table = cls.__table__
+        sa.Index(f'ix_{table.name}_period', table.c.period)
+        if cls.__TOTALS_PERIOD__ is not None:
+            assert cls.__TOTALS_PERIOD__ in ('day', 'month', 'year')
+            cls.__totals__ = cls._make_aggregate_table('totals')
+            cls.__snapshots__ = cls._make_aggregate_table('snapshots')
+
+    @classmethod
+    def _make_aggregate_table(cls, suffix: str) -> sa.Table:
+        table = cls.__table__
+        return sa.Table(
+            f'{table.name}__{suffix}',
+            cls.metadata,
+            sa.Column('period', table.c.period.type, primary_key=True),
+            *(sa.Column(name, table.c[name].type, primary_key=True) for name in cls.__DIMENSIONS__),
+            *(sa.Column(name, table.c[name].type, nullable=False) for name in cls.__RESOURCES__),
+            schema=table.schema,
+        )
+
+
+REGISTER = TypeVar('REGISTER', bound=AccumulationRegister)
@@ -50,11 +50,11 @@ class BaseFilterProcessor[_T]:
                 assert isinstance(value, dict), f'Value is not a dict: {value}'
                 group_type = ClauseGroupType(key)
                 if group_type is ClauseGroupType.AND:
-                    clauses.append(AndClause(*self.build_clauses(value)))
+                    clauses.append(AndClause(self.build_clauses(value)))
                 elif group_type is ClauseGroupType.OR:
-                    clauses.append(OrClause(*self.build_clauses(value)))
+                    clauses.append(OrClause(self.build_clauses(value)))
                 elif group_type is ClauseGroupType.NOT:
-                    clauses.append(NotClause(*self.build_clauses(value)))
+                    clauses.append(NotClause(self.build_clauses(value)))
                 else:
                     raise RuntimeError(f"Unknown group type {group_type}")
             else:
@@ -63,16 +63,15 @@ class BaseFilterProcessor[_T]:
 
     def build_clause(self, key: str, op: FilterOperand, value: Any) -> CLAUSE:
         schema = self.schema
-        if '.' in key:
-            *rel_names, col_name = key.split('.')
-            for rel_name in rel_names:
-                rel: REL_SCH = schema.get_attr(rel_name)
-                assert rel.attr.is_relation
-                schema = self.app_schema.get_reference(rel.to_model)
-        return ClauseBuilder.build(schema=schema.get_attr(key), op=op, value=value, full_path=key)
+        *rel_names, col_name = key.split('.')
+        for rel_name in rel_names:
+            rel: REL_SCH = schema.get_attr(rel_name)
+            assert rel.attr.is_relation
+            schema = self.app_schema.get_reference(rel.to_model)
+        return ClauseBuilder.build(schema=schema.get_attr(col_name), op=op, value=value, full_path=key)
 
     @classmethod
-    def get_operand_and_value(cls, value: Sequence[str, Any]) -> tuple[FilterOperand, Any]:
+    def get_operand_and_value(cls, value: Sequence[Any]) -> tuple[FilterOperand, Any]:
         assert isinstance(value, Sequence) and len(value) == 2, 'value must be like [operand, value]'
         op, filter_value = value
         return FilterOperand(op), filter_value
@@ -0,0 +1,163 @@
+from typing import Type, Self
+
+from sqlalchemy import ColumnElement, Select, select, literal_column
+from sqlalchemy.orm import aliased, InstrumentedAttribute
+from sqlalchemy.orm.util import AliasedClass
+
+from core.db.models import Model, MODEL
+from core.schema import O_SCH, AppSchema, REL_SCH, A_SCH
+
+
+__all__ = ["JoinPlan"]
+
+
+class JoinPlan:
+    """
+    Resolves dotted paths like "user.username" to columns of aliased entities.
+    Every forward relation path is joined once (LEFT OUTER JOIN), no matter how many paths share it.
+    Paths through reverse relations are not joined, expressions on them are wrapped into EXISTS subquery,
+    one per reverse relation in AND group (see wrap_all).
+    """
+
+    def __init__(
+            self,
+            schema: O_SCH,
+            entity: Type[MODEL] | AliasedClass,
+            app_schema: AppSchema,
+            prefix: tuple[str, ...] = (),
+    ):
+        self.schema = schema
+        self.entity = entity
+        self.app_schema = app_schema
+        self.prefix = prefix
+        self.correlation: ColumnElement[bool] | None = None
+
+        self._joins: dict[tuple[str, ...], tuple[AliasedClass, O_SCH, ColumnElement[bool]]] = {}
+        self._subqueries: dict[tuple[str, ...], JoinPlan] = {}
+        self._columns: dict[str, InstrumentedAttribute] = {}
+        self._reverse: dict[str, tuple[tuple[str, ...], str]] = {}
+
+    def add_path(self, field: str) -> None:
+        if field in self._columns or field in self._reverse:
+            return
+        *rel_names, col_name = field.split('.')
+        entity, schema, path = self.entity, self.schema, ()
+        for idx, rel_name in enumerate(rel_names):
+            rel: REL_SCH = schema.get_attr(rel_name)
+            if rel is None or not rel.attr.is_relation:
+                raise ValueError(f'"{rel_name}" is not relation of "{schema.full_name}"')
+            path += (rel_name,)
+            if rel.type.is_reverse:
+                sub = self._subqueries.get(path)
+                if sub is None:
+                    sub = self._subqueries[path] = self._make_subquery(entity, rel, path)
+                rest = '.'.join((*rel_names[idx + 1:], col_name))
+                sub.add_path(rest)
+                self._reverse[field] = (path, rest)
+                return
+            if path not in self._joins:
+                self._joins[path] = self._make_join(entity, rel, path)
+            entity, schema, _ = self._joins[path]
+        if schema.get_attr(col_name) is None:
+            raise ValueError(f'"{col_name}" is not attr of "{schema.full_name}"')
+        self._columns[field] = getattr(entity, col_name)
+
+    def _make_join(
+            self,
+            entity: Type[MODEL] | AliasedClass,
+            rel: REL_SCH,
+            path: tuple[str, ...],
+    ) -> tuple[AliasedClass, O_SCH, ColumnElement[bool]]:
+        alias = aliased(Model.find_by_name(rel.to_model, raise_if_none=True), name='__'.join(self.prefix + path))
+        onclause = getattr(alias, rel.remote_key) == getattr(entity, rel.local_key)
+        return alias, self.app_schema.get_reference(rel.to_model), onclause
+
+    def _make_subquery(self, entity: Type[MODEL] | AliasedClass, rel: REL_SCH, path: tuple[str, ...]) -> "JoinPlan":
+        prefix = self.prefix + path
+        alias = aliased(Model.find_by_name(rel.to_model, raise_if_none=True), name='__'.join(prefix))
+        sub = JoinPlan(
+            schema=self.app_schema.get_reference(rel.to_model),
+            entity=alias,
+            app_schema=self.app_schema,
+            prefix=prefix,
+        )
+        sub.correlation = getattr(alias, rel.remote_key) == getattr(entity, rel.local_key)
+        return sub
+
+    def attr(self, field: str) -> A_SCH:
+        """Schema of the attr at the end of the path"""
+        *rel_names, col_name = field.split('.')
+        schema = self.schema
+        for rel_name in rel_names:
+            schema = self.app_schema.get_reference(schema.get_attr(rel_name).to_model)
+        return schema.get_attr(col_name)
+
+    def is_nullable(self, field: str) -> bool:
+        """Column can be NULL in result row: it is nullable itself or one of forward keys on the path is"""
+        assert not self.is_reverse(field)
+        *rel_names, col_name = field.split('.')
+        schema = self.schema
+        for rel_name in rel_names:
+            rel: REL_SCH = schema.get_attr(rel_name)
+            if schema.get_attr(rel.local_key).nullable:
+                return True
+            schema = self.app_schema.get_reference(rel.to_model)
+        return schema.get_attr(col_name).nullable
+
+    def is_reverse(self, field: str) -> bool:
+        self.add_path(field)
+        return field in self._reverse
+
+    def column(self, field: str) -> InstrumentedAttribute:
+        self.add_path(field)
+        if field in self._reverse:
+            path, rest = self._reverse[field]
+            return self._subqueries[path].column(rest)
+        return self._columns[field]
+
+    def wrap(self, field: str, expression: ColumnElement[bool]) -> ColumnElement[bool]:
+        """Put expression, built on column(field), into EXISTS if field is behind reverse relation"""
+        return self.wrap_all([(field, expression)])[0]
+
+    def wrap_all(self, items: list[tuple[str | None, ColumnElement[bool]]]) -> list[ColumnElement[bool]]:
+        """
+        Expressions of one AND group with their fields. Expressions behind the same reverse relation are put
+        into one EXISTS, so they must hold for the same related row. Items without field are kept as is.
+        """
+        result: list[ColumnElement[bool] | tuple[str, ...]] = []
+        grouped: dict[tuple[str, ...], list[tuple[str, ColumnElement[bool]]]] = {}
+        for field, expression in items:
+            if field is not None:
+                self.add_path(field)
+            if field is None or field not in self._reverse:
+                result.append(expression)
+                continue
+            path, rest = self._reverse[field]
+            if path not in grouped:
+                grouped[path] = []
+                result.append(path)
+            grouped[path].append((rest, expression))
+        for idx, item in enumerate(result):
+            if isinstance(item, tuple):
+                sub = self._subqueries[item]
+                result[idx] = sub.exists(*sub.wrap_all(grouped[item]))
+        return result
+
+    def exists(self, *criteria: ColumnElement[bool]) -> ColumnElement[bool]:
+        assert self.correlation is not None, 'Only subquery plan can be used as EXISTS'
+        query = self.apply(select(literal_column('1')).select_from(self.entity))
+        return query.where(self.correlation, *criteria).exists()
+
+    def apply[S: Select](self, query: S) -> S:
+        for alias, _, onclause in self._joins.values():
+            query = query.outerjoin(alias, onclause)
+        return query
+
+    def copy(self) -> Self:
+        plan = self.__class__(schema=self.schema, entity=self.entity, app_schema=self.app_schema, prefix=self.prefix)
+        plan.correlation = self.correlation
+        plan._joins = {**self._joins}
+        plan._subqueries = {**self._subqueries}
+        plan._columns = {**self._columns}
+        plan._reverse = {**self._reverse}
+        return plan
@@ -0,0 +1,77 @@
+from typing import Any, Hashable, Callable
+
+from .._base import FilterOperand
+from ._base import BaseFilterProcessor
+
+
+__all__ = ["FilterShape", "FilterPlan", "get_filters_shape", "parametrize_filters"]
+
+
+FilterShape = tuple[Hashable, ...]
+
+LIST_OPERANDS = frozenset((FilterOperand.in_, FilterOperand.not_in))
+
+
+def get_filters_shape(filters: dict[str, Any]) -> tuple[FilterShape, list[Any]]:
+    """
+    Split filters into hashable shape (keys, operands and groups structure) and flat list of values.
+    None values are part of the shape, because they are compiled into "IS NULL" instead of parameter.
+    """
+    values = []
+    return _collect_shape(filters, values), values
+
+
+def _collect_shape(filters: dict[str, Any], values: list[Any]) -> FilterShape:
+    shape = []
+    for key, value in filters.items():
+        if key.startswith('['):
+            assert isinstance(value, dict), f'Value is not a dict: {value}'
+            shape.append((key, _collect_shape(value, values)))
+        else:
+            op, filter_value = BaseFilterProcessor.get_operand_and_value(value)
+            if filter_value is None:
+                shape.append((key, op, None))
+            else:
+                shape.append((key, op))
+                values.append(filter_value)
+    return tuple(shape)
+
+
+def parametrize_filters[P](
+        filters: dict[str, Any],
+        make_param: Callable[[str, bool], P],
+) -> tuple[dict[str, Any], tuple[str, ...]]:
+    """
+    Replace every non-None value with parameter built by make_param(name, is_list).
+    Parameters are named in the same order, as values are collected by get_filters_shape.
+    """
+    names = []
+    return _replace_values(filters, make_param, names), tuple(names)
+
+
+def _replace_values(filters: dict[str, Any], make_param: Callable, names: list[str]) -> dict[str, Any]:
+    parametrized = {}
+    for key, value in filters.items():
+        if key.startswith('['):
+            parametrized[key] = _replace_values(value, make_param, names)
+        else:
+            op, filter_value = BaseFilterProcessor.get_operand_and_value(value)
+            if filter_value is not None:
+                name = f'fp_{len(names)}'
+                names.append(name)
+                filter_value = make_param(name, op in LIST_OPERANDS)
+            parametrized[key] = (op, filter_value)
+    return parametrized
+
+
+class FilterPlan[_T]:
+    """Filters of some shape, compiled once with parameters instead of values"""
+
+    def __init__(self, shape: FilterShape, clauses: list[_T], param_names: tuple[str, ...]):
+        self.shape = shape
+        self.clauses = clauses
+        self.param_names = param_names
+
+    def bind(self, values: list[Any]) -> dict[str, Any]:
+        assert len(values) == len(self.param_names)
+        return dict(zip(self.param_names, values))
@@ -1,17 +1,126 @@
-from typing import Any
+from typing import Any, Type
 
-from sqlalchemy import ColumnElement, and_, or_, not_, Select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import (
+    ColumnElement, and_, or_, not_, Select, bindparam, BindParameter, String, TypeDecorator, type_coerce,
+)
 
+from core.db.models import Model, MODEL
+from core.schema import O_SCH, AppSchema
+from core.settings import settings
+from core.utils import LRUCache
 from ._base import BaseFilterProcessor
-from .. import groups, columns as cols, CLAUSE
+from .joins import JoinPlan
+from .plans import FilterPlan, FilterShape, get_filters_shape, parametrize_filters
+from .. import groups, columns as cols, CLAUSE, CLAUSE_GROUP
 
-__all__ = ["SaFilterProcessor"]
+__all__ = ["SaFilterProcessor", "SaFilterPlan"]
+
+
+class SaFilterPlan(FilterPlan[ColumnElement[bool]]):
+    def __init__(
+            self,
+            shape: FilterShape,
+            clauses: list[ColumnElement[bool]],
+            param_names: tuple[str, ...],
+            joins: JoinPlan,
+    ):
+        super().__init__(shape=shape, clauses=clauses, param_names=param_names)
+        self.joins = joins
 
 
 class SaFilterProcessor(BaseFilterProcessor[ColumnElement[bool]]):
-    def apply_filters[S: Select](self, query: S, filters: dict[str, Any], **kwargs) -> S:
-        return query.filter(*self.process_filters(filters, **kwargs))
+    _plans: LRUCache[tuple[str, FilterShape], SaFilterPlan] = LRUCache(maxsize=settings.filter_plans_cache_size)
+
+    def __init__(self, schema: O_SCH, app_schema: AppSchema = None, model: Type[MODEL] = None):
+        super().__init__(schema=schema, app_schema=app_schema)
+        self.model = model if model is not None else Model.find_by_name(schema.full_name, raise_if_none=True)
+
+    def join_plan(self) -> JoinPlan:
+        return JoinPlan(schema=self.schema, entity=self.model, app_schema=self.app_schema)
+
+    def process_filters(self, filters: dict[str, Any], *, joins: JoinPlan, **kwargs) -> list[ColumnElement[bool]]:
+        others = {**kwargs, 'model': self.model, 'joins': joins, 'schema': self.schema, 'app_schema': self.app_schema}
+        return self.process_clauses(self.build_clauses(filters), others=others, conjunction=True)
+
+    def process_clauses(
+            self,
+            clauses: list[CLAUSE | CLAUSE_GROUP],
+            others: dict[str, Any],
+            conjunction: bool = False,
+    ) -> list[ColumnElement[bool]]:
+        """Clauses behind reverse relations are wrapped into EXISTS: in conjunction one per relation"""
+        joins: JoinPlan = others['joins']
+        items = [
+            (None, self.process_clause_group(clause, others=others)) if clause.is_group
+            else (clause.field, self.process_clause(clause, others=others))
+            for clause in clauses
+        ]
+        if conjunction:
+            return joins.wrap_all(items)
+        return [expression if field is None else joins.wrap(field, expression) for field, expression in items]
+
+    def process_clause_group(self, clause_group: CLAUSE_GROUP, others: dict[str, Any]) -> ColumnElement[bool]:
+        conjunction = not isinstance(clause_group, groups.OrClause)
+        processed_clauses = self.process_clauses(clause_group.clauses, others=others, conjunction=conjunction)
+        return self._group_processor[clause_group.__class__](processed_clauses, others)
+
+    def get_plan(self, shape: FilterShape, filters: dict[str, Any]) -> SaFilterPlan:
+        key = (self.schema.full_name, shape)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self.compile_plan(shape, filters)
+            self._plans.set(key, plan)
+        return plan
+
+    def compile_plan(self, shape: FilterShape, filters: dict[str, Any]) -> SaFilterPlan:
+        parametrized_filters, param_names = parametrize_filters(filters, make_param=self.make_param)
+        joins = self.join_plan()
+        clauses = self.process_filters(parametrized_filters, joins=joins)
+        return SaFilterPlan(shape=shape, clauses=clauses, param_names=param_names, joins=joins)
+
+    @staticmethod
+    def make_param(name: str, is_list: bool) -> BindParameter:
+        return bindparam(name, expanding=is_list)
+
+    def compile_filters(self, filters: dict[str, Any]) -> tuple[SaFilterPlan, dict[str, Any]]:
+        """Returns cached plan (clauses with bind parameters and joins they need) and values for parameters"""
+        shape, values = get_filters_shape(filters)
+        plan = self.get_plan(shape, filters)
+        return plan, plan.bind(values)
+
+    def apply_filters[S: Select](self, query: S, filters: dict[str, Any]) -> S:
+        if not filters:
+            return query
+        plan, params = self.compile_filters(filters)
+        query = plan.joins.apply(query).filter(*plan.clauses)
+        return query.params(**params) if params else query
+
+
+def get_column(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement:
+    return others['joins'].column(clause.field)
+
+
+LIKE_ESCAPE = '/'
+
+
+class _LikeEscaped(TypeDecorator[str]):
+    """
+    Value of startswith/endswith/contains is matched literally: its wildcards are escaped on binding.
+    autoescape=True can't be used, because value is bind parameter of cached plan.
+    """
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value: str | None, dialect) -> str | None:
+        if value is None:
+            return None
+        for char in (LIKE_ESCAPE, '%', '_'):
+            value = value.replace(char, LIKE_ESCAPE + char)
+        return value
+
+
+def get_like_value(clause: CLAUSE) -> ColumnElement[str]:
+    return type_coerce(clause.value, _LikeEscaped())
 
 
 @SaFilterProcessor.group(groups.AndClause)
@@ -45,5 +154,99 @@ def make_not_clause(clauses: list[ColumnElement[bool]], _) -> ColumnElement[bool
 @SaFilterProcessor.clause(cols.StringEqualClause)
 @SaFilterProcessor.clause(cols.TextEqualClause)
 @SaFilterProcessor.clause(cols.TimeEqualClause)
-def make_equal_clause(clause: CLAUSE, _):
+def make_equal_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others) == clause.value
+
+
+@SaFilterProcessor.clause(cols.BooleanNotEqualClause)
+@SaFilterProcessor.clause(cols.DateNotEqualClause)
+@SaFilterProcessor.clause(cols.DateTimeNotEqualClause)
+@SaFilterProcessor.clause(cols.EnumNotEqualClause)
+@SaFilterProcessor.clause(cols.GuidNotEqualClause)
+@SaFilterProcessor.clause(cols.IntegerNotEqualClause)
+@SaFilterProcessor.clause(cols.NumericNotEqualClause)
+@SaFilterProcessor.clause(cols.StringNotEqualClause)
+@SaFilterProcessor.clause(cols.TextNotEqualClause)
+@SaFilterProcessor.clause(cols.TimeNotEqualClause)
+def make_not_equal_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others) != clause.value
+
+
+@SaFilterProcessor.clause(cols.DateLtClause)
+@SaFilterProcessor.clause(cols.DateTimeLtClause)
+@SaFilterProcessor.clause(cols.IntegerLtClause)
+@SaFilterProcessor.clause(cols.NumericLtClause)
+@SaFilterProcessor.clause(cols.TimeLtClause)
+def make_lt_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others) < clause.value
+
+
+@SaFilterProcessor.clause(cols.DateLteClause)
+@SaFilterProcessor.clause(cols.DateTimeLteClause)
+@SaFilterProcessor.clause(cols.IntegerLteClause)
+@SaFilterProcessor.clause(cols.NumericLteClause)
+@SaFilterProcessor.clause(cols.TimeLteClause)
+def make_lte_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others) <= clause.value
+
+
+@SaFilterProcessor.clause(cols.DateGtClause)
+@SaFilterProcessor.clause(cols.DateTimeGtClause)
+@SaFilterProcessor.clause(cols.IntegerGtClause)
+@SaFilterProcessor.clause(cols.NumericGtClause)
+@SaFilterProcessor.clause(cols.TimeGtClause)
+def make_gt_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others) > clause.value
+
+
+@SaFilterProcessor.clause(cols.DateGteClause)
+@SaFilterProcessor.clause(cols.DateTimeGteClause)
+@SaFilterProcessor.clause(cols.IntegerGteClause)
+@SaFilterProcessor.clause(cols.NumericGteClause)
+@SaFilterProcessor.clause(cols.TimeGteClause)
+def make_gte_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others) >= clause.value
+
+
+@SaFilterProcessor.clause(cols.DateInClause)
+@SaFilterProcessor.clause(cols.DateTimeInClause)
+@SaFilterProcessor.clause(cols.EnumInClause)
+@SaFilterProcessor.clause(cols.GuidInClause)
+@SaFilterProcessor.clause(cols.IntegerInClause)
+@SaFilterProcessor.clause(cols.NumericInClause)
+@SaFilterProcessor.clause(cols.StringInClause)
+@SaFilterProcessor.clause(cols.TextInClause)
+@SaFilterProcessor.clause(cols.TimeInClause)
+def make_in_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others).in_(clause.value)
+
+
+@SaFilterProcessor.clause(cols.DateNotInClause)
+@SaFilterProcessor.clause(cols.DateTimeNotInClause)
+@SaFilterProcessor.clause(cols.EnumNotInClause)
+@SaFilterProcessor.clause(cols.GuidNotInClause)
+@SaFilterProcessor.clause(cols.IntegerNotInClause)
+@SaFilterProcessor.clause(cols.NumericNotInClause)
+@SaFilterProcessor.clause(cols.StringNotInClause)
+@SaFilterProcessor.clause(cols.TextNotInClause)
+@SaFilterProcessor.clause(cols.TimeNotInClause)
+def make_not_in_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others).not_in(clause.value)
+
+
+@SaFilterProcessor.clause(cols.StringStartswithClause)
+@SaFilterProcessor.clause(cols.TextStartswithClause)
+def make_startswith_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others).startswith(get_like_value(clause), escape=LIKE_ESCAPE)
+
+
+@SaFilterProcessor.clause(cols.StringEndswithClause)
+@SaFilterProcessor.clause(cols.TextEndswithClause)
+def make_endswith_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others).endswith(get_like_value(clause), escape=LIKE_ESCAPE)
+
 
+@SaFilterProcessor.clause(cols.StringContainsClause)
+@SaFilterProcessor.clause(cols.TextContainsClause)
+def make_contains_clause(clause: CLAUSE, others: dict[str, Any]) -> ColumnElement[bool]:
+    return get_column(clause, others).contains(get_like_value(clause), escape=LIKE_ESCAPE)
@@ -1,2 +1,3 @@
 from ._base import *
 from .registry import *
+from .identity import *
@@ -3,7 +3,7 @@ from typing import Type, Any, Generic, TypeVar, Self, cast
 
 from core.types import PK
 from core.schema import O_SCH, LIST_SCH
-from core.validators import O_VAL, LIST_VAL
+from core.validators import O_VAL, LIST_VAL, UniqueScope
 from .registry import get_repository, DEFAULT_REPOSITORY_KEY
 
 
@@ -20,6 +20,7 @@ class AbstractRepository:
     schema: O_SCH | LIST_SCH
     validator_cls: Type[O_VAL | LIST_VAL]
     related_map: dict[str, str]
+    _related_cls: dict[str, Type["O_REP"]]
     context: dict[str, Any]
 
     @property
@@ -33,25 +34,41 @@ class AbstractRepository:
         return getattr(cls, 'schema', None) is not None
 
     def related_repository(self, attr: str) -> "O_REP":
-        for rel in self.schema.get_relations():
-            if rel.name == attr:
-                repo = get_repository(
-                    name=rel.to_model,
-                    variant=self.related_map[attr],
-                    raise_if_none=True,
-                )
-                return repo(context=self.context)
-        raise ValueError(f'No relation with name "{attr}" found in schema "{self.schema.name}"')
+        repo = self._related_cls.get(attr)
+        if repo is None:
+            repo = self.resolve_related(attr)
+        return repo(context=self.context)
+
+    @classmethod
+    def resolve_related(cls, attr: str, raise_if_none: bool = True) -> Type["O_REP"] | None:
+        """Related repository class is looked up in registry once, then it is taken from _related_cls"""
+        rel = cls.schema.get_attr(attr)
+        if rel is None or not rel.attr.is_relation:
+            raise ValueError(f'No relation with name "{attr}" found in schema "{cls.schema.name}"')
+        repo = get_repository(name=rel.to_model, variant=cls.related_map[attr], raise_if_none=raise_if_none)
+        if repo is not None:
+            cls._related_cls[attr] = repo
+        return repo
+
+    @classmethod
+    def resolve_all_related(cls) -> None:
+        """Related repositories, registered later, are resolved lazily on first use"""
+        for rel in cls.schema.get_relations():
+            if rel.name not in cls._related_cls:
+                cls.resolve_related(rel.name, raise_if_none=False)
 
     def __init_subclass__(cls, schema: O_SCH | LIST_SCH = None):
         if schema is None:
             return
         assert not cls.is_schema_bound()
         cls.schema = schema
+        cls.validator_cls = cls.validator_cls.bind(schema=schema)
         if getattr(cls, 'related_map', None) is None:
             cls.related_map = {}
         for rel in schema.get_relations():
             cls.related_map.setdefault(rel.name, DEFAULT_REPOSITORY_KEY)
+        cls._related_cls = {}
+        cls.resolve_all_related()
 
 
 ABC_REP = TypeVar('ABC_REP', bound=AbstractRepository)
@@ -125,12 +142,24 @@ class AbstractObjectRepository(ABC, Generic[ANY_MODEL, O_SCH, O_VAL], AbstractRe
     @abstractmethod
     async def get_one(self, pk: PK, raise_if_none: bool = True, **kwargs) -> ANY_MODEL | None: ...
 
+    @abstractmethod
+    async def get_lists(self, pks: list[PK], names: list[str] = None) -> dict[str, dict[PK, list[Any]]]: ...
+
     @abstractmethod
     async def create(self, data: dict[str, Any], **kwargs) -> ANY_MODEL: ...
 
     @abstractmethod
     async def update(self, data: dict[str, Any], **kwargs) -> ANY_MODEL: ...
 
+    @abstractmethod
+    async def create_many(self, data: list[dict[str, Any]], **kwargs) -> dict[PK, ANY_MODEL]: ...
+
+    @abstractmethod
+    async def update_many(self, data: list[dict[str, Any]], **kwargs) -> dict[PK, ANY_MODEL]: ...
+
+    @abstractmethod
+    async def upsert_many(self, data: list[dict[str, Any]], **kwargs) -> dict[PK, ANY_MODEL]: ...
+
     @abstractmethod
     async def delete(self, pk, **kwargs) -> None: ...
 
@@ -140,10 +169,19 @@ class AbstractObjectRepository(ABC, Generic[ANY_MODEL, O_SCH, O_VAL], AbstractRe
     @abstractmethod
     async def is_unique(self, attr_name: str, value: Any) -> bool: ...
 
+    @abstractmethod
+    async def is_unique_many(self, attr_name: str, values: list[Any], scope: UniqueScope = None) -> list[bool]: ...
+
+    @abstractmethod
+    async def is_unique_attrs(self, values: dict[str, Any]) -> dict[str, bool]: ...
+
     # only for Documents. Others must raise error
     @abstractmethod
     async def conduct(self) -> None: ...
 
+    @abstractmethod
+    async def unconduct(self) -> None: ...
+
 
 O_REP = TypeVar('O_REP', bound=AbstractObjectRepository)
 
@@ -169,6 +207,9 @@ class AbstractListRepository(ABC, Generic[O_REP, ANY_LIST, LIST_SCH, LIST_VAL],
     @abstractmethod
     async def get(self, **kwargs) -> list[ANY_LIST]: ...
 
+    @abstractmethod
+    async def get_many(self, owner_pks: list[PK]) -> dict[PK, list[ANY_LIST]]: ...
+
     @abstractmethod
     async def add(self, **kwargs) -> None: ...
 
@@ -178,5 +219,8 @@ class AbstractListRepository(ABC, Generic[O_REP, ANY_LIST, LIST_SCH, LIST_VAL],
     @abstractmethod
     async def clear(self, **kwargs) -> None: ...
 
+    @abstractmethod
+    async def sync(self, data: list[dict[str, Any]], **kwargs) -> Any: ...
+
 
 LIST_REP = TypeVar('LIST_REP', bound=AbstractListRepository)
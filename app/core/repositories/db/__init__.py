@@ -1,3 +1,6 @@
 from .objects import *
 from .lists import *
 from .filters import *
+from .cache import *
+from .movements import *
+from .balances import *
@@ -0,0 +1,70 @@
+from itertools import groupby
+from typing import Any, Iterator, Iterable
+
+from sqlalchemy import ColumnElement, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from core.settings import settings
+from core.utils import chunked
+
+
+__all__ = ["SaRowsMixin", "MAX_QUERY_PARAMS", "any_of"]
+
+# asyncpg (postgres protocol) limit of bind parameters in one statement
+MAX_QUERY_PARAMS = 32767
+
+
+def any_of(col: ColumnElement, keys: list[Any]) -> ColumnElement[bool]:
+    """col = ANY(:keys). Keys are one array parameter, so statement is the same for any number of keys"""
+    return col == any_(literal(keys, ARRAY(col.type)))
+
+
+class SaRowsMixin:
+    """Validated data to column values and their grouping into batched statements"""
+
+    async def _prepare_rows(self, list_data: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Hook for preparation, that can't be done row by row synchronously (e.g. offloaded to pool)"""
+        return [self._prepare_row(data) for data in list_data]
+
+    def _prepare_row(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Validated data to column values. Properties are applied to transient instance to get columns they set"""
+        row, properties = {}, {}
+        for name, value in data.items():
+            self._put_attr(row, properties, name, value)
+        if properties:
+            obj = self.model(**row)
+            for name, value in properties.items():
+                setattr(obj, name, value)
+            row = {
+                attr.key: obj.__dict__[attr.key]
+                for attr in self.model.__mapper__.column_attrs
+                if attr.key in obj.__dict__
+            }
+        return row
+
+    def _put_attr(self, row: dict[str, Any], properties: dict[str, Any], name: str, value: Any) -> None:
+        attr = self.schema.get_attr(name)
+        if attr.attr.is_relation:
+            row[attr.local_key] = None if value is None else getattr(value, attr.remote_key)
+        elif attr.attr.is_property:
+            properties[name] = value
+        elif attr.attr.is_composite:
+            chosen, chosen_value = value if value is not None else (None, None)
+            for composite_attr in attr.attrs:
+                self._put_attr(row, properties, composite_attr, chosen_value if composite_attr == chosen else None)
+        else:
+            row[name] = value
+
+    @staticmethod
+    def _group_rows(rows: list[dict[str, Any]]) -> Iterator[tuple[tuple[str, ...], list[dict[str, Any]]]]:
+        """Rows with the same columns go into one statement"""
+        key = lambda row: tuple(sorted(row))
+        for keys, group in groupby(sorted(rows, key=key), key=key):
+            yield keys, list(group)
+
+    def _iter_chunks(self, rows: list[dict[str, Any]], chunk_size: int = None) -> Iterator[tuple[tuple, list]]:
+        """Groups of rows with the same columns, size is limited by chunk size and params limit"""
+        chunk_size = chunk_size or settings.bulk_write_chunk_size
+        for keys, group in self._group_rows(rows):
+            size = max(1, min(chunk_size, MAX_QUERY_PARAMS // max(len(keys), 1)))
+            yield from ((keys, chunk) for chunk in chunked(group, size))
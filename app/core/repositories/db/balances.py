@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import Any, Type
+
+from sqlalchemy import (
+    select, delete, func, literal, literal_column, union_all, or_, and_,
+    ColumnElement, Delete, Executable, Insert, Row, Select, Table,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from core.db import REGISTER
+from core.db.connection import AsyncSession
+from core.types import PK
+from ._rows import any_of
+
+
+__all__ = ["RegisterBalances"]
+
+
+class RegisterBalances:
+    """
+    Balances of accumulation register at any moment: the last snapshot before it, totals of periods
+    between snapshot and the period of the moment, and movements of this period before the moment.
+    Totals are changed by the same statements, which write and delete movements on conducting.
+    """
+
+    def __init__(self, register: Type[REGISTER], session: AsyncSession):
+        assert register.__totals__ is not None, f'Register "{register.__full_name__}" has no totals'
+        self.register = register
+        self.session = session
+
+    async def get(self, at: datetime, **dimensions: Any) -> list[Row]:
+        """Non-zero balances by dimensions before the moment, dimensions can be filtered by equality"""
+        return list(await self.session.execute(self._balances(self._trunc(self.register, self._at(at)), at, dimensions)))
+
+    async def close_period(self, period: datetime) -> None:
+        """
+        Snapshot of balances at the start of the period. Later balances are read starting from it.
+        Totals rows, which became zero on unconducting, are deleted here as well.
+        """
+        totals, snapshots = self.register.__totals__, self.register.__snapshots__
+        await self.session.execute(
+            delete(totals).where(*(totals.c[name] == 0 for name in self.register.__RESOURCES__))
+        )
+        bucket = self._trunc(self.register, self._at(period))
+        await self.session.execute(delete(snapshots).where(snapshots.c.period == bucket))
+        balances = self._balances(bucket, None, {}).subquery()
+        await self.session.execute(
+            insert(snapshots).from_select(
+                ['period', *balances.c.keys()],
+                select(bucket, *balances.c),
+            )
+        )
+
+    @staticmethod
+    def with_totals(register: Type[REGISTER], statement: Insert | Delete, sign: int) -> Executable:
+        """
+        Statement, which writes (sign=1) or deletes (sign=-1) movements, is wrapped into CTE,
+        and its returned rows are added to totals by one upsert. Rows, which reach zero, are kept
+        (the upsert can't see them in the same statement), they are deleted by close_period.
+        """
+        totals = register.__totals__
+        if totals is None:
+            return statement
+        table = register.__table__
+        dimensions, resources = register.__DIMENSIONS__, register.__RESOURCES__
+        changed = statement.returning(
+            table.c.period, *(table.c[name] for name in (*dimensions, *resources))
+        ).cte('changed_movements')
+        period = RegisterBalances._trunc(register, changed.c.period)
+        delta = select(
+            period.label('period'),
+            *(changed.c[name] for name in dimensions),
+            *((sign * func.sum(changed.c[name])).label(name) for name in resources),
+        ).group_by(period, *(changed.c[name] for name in dimensions))
+        query = insert(totals).from_select(['period', *dimensions, *resources], delta)
+        return query.on_conflict_do_update(
+            index_elements=['period', *dimensions],
+            set_={name: totals.c[name] + query.excluded[name] for name in resources},
+        )
+
+    @staticmethod
+    def invalidate_snapshots(register: Type[REGISTER], pks: list[PK]) -> Delete | None:
+        """Snapshots after the first period of movements of documents are outdated"""
+        snapshots = register.__snapshots__
+        if snapshots is None:
+            return None
+        first = select(func.min(register.period)).where(any_of(register.recorder_id, pks)).scalar_subquery()
+        return delete(snapshots).where(snapshots.c.period > RegisterBalances._trunc(register, first))
+
+    @staticmethod
+    def _trunc(register: Type[REGISTER], value: ColumnElement) -> ColumnElement:
+        # unit is rendered inline, so the same expression in select and group by is recognized by postgres
+        period_type = register.__table__.c.period.type
+        return func.date_trunc(literal_column(f"'{register.__TOTALS_PERIOD__}'"), value, type_=period_type)
+
+    def _at(self, value: datetime) -> ColumnElement:
+        return literal(value, self.register.__table__.c.period.type)
+
+    def _balances(self, bucket: ColumnElement, at: datetime | None, dimensions: dict[str, Any]) -> Select:
+        register, totals, snapshots = self.register, self.register.__totals__, self.register.__snapshots__
+        names = [*register.__DIMENSIONS__, *register.__RESOURCES__]
+
+        def part(table: Table, *where: ColumnElement[bool]) -> Select:
+            filters = [table.c[name] == value for name, value in dimensions.items()]
+            return select(*(table.c[name] for name in names)).where(*where, *filters)
+
+        snapshot_period = select(func.max(snapshots.c.period)).where(snapshots.c.period <= bucket).scalar_subquery()
+        parts = [
+            part(snapshots, snapshots.c.period == snapshot_period),
+            part(
+                totals,
+                totals.c.period < bucket,
+                or_(snapshot_period.is_(None), totals.c.period >= snapshot_period),
+            ),
+        ]
+        if at is not None:
+            table = register.__table__
+            parts.append(part(table, and_(table.c.period >= bucket, table.c.period < self._at(at))))
+        union = union_all(*parts).subquery()
+        return (
+            select(
+                *(union.c[name] for name in register.__DIMENSIONS__),
+                *(func.sum(union.c[name]).label(name) for name in register.__RESOURCES__),
+            )
+            .group_by(*(union.c[name] for name in register.__DIMENSIONS__))
+            .having(or_(*(func.sum(union.c[name]) != 0 for name in register.__RESOURCES__)))
+        )
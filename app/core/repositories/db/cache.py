@@ -0,0 +1,206 @@
+from abc import ABC, abstractmethod
+from typing import Any, Hashable, Type
+
+from sqlalchemy import event, Table, inspect
+from sqlalchemy.dialects.postgresql import Insert as PgInsert
+from sqlalchemy.orm import Session, ORMExecuteState, make_transient_to_detached, Mapper
+from sqlalchemy.orm.attributes import set_committed_value
+
+from core.constants import EMPTY
+from core.db.models import MODEL
+from core.settings import settings
+from core.utils import TTLCache
+
+
+__all__ = [
+    "CacheBackend", "MemoryCacheBackend", "CacheStats", "ObjectCache",
+    "get_object_cache", "get_cache_stats",
+]
+
+
+class CacheBackend(ABC):
+    """Storage of object snapshots. Values are dicts of column values, so they can be kept out of process"""
+
+    @abstractmethod
+    def get_many(self, keys: list[Hashable]) -> dict[Hashable, dict[str, Any]]: ...
+
+    @abstractmethod
+    def set_many(self, items: dict[Hashable, dict[str, Any]]) -> None: ...
+
+    @abstractmethod
+    def delete_many(self, keys: list[Hashable]) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int = None, ttl: float = None):
+        self._cache: TTLCache[Hashable, dict[str, Any]] = TTLCache(
+            maxsize=maxsize or settings.object_cache_size,
+            ttl=ttl or settings.object_cache_ttl,
+        )
+
+    def get_many(self, keys: list[Hashable]) -> dict[Hashable, dict[str, Any]]:
+        found = {}
+        for key in keys:
+            value = self._cache.get(key, EMPTY)
+            if value is not EMPTY:
+                found[key] = value
+        return found
+
+    def set_many(self, items: dict[Hashable, dict[str, Any]]) -> None:
+        for key, value in items.items():
+            self._cache.set(key, value)
+
+    def delete_many(self, keys: list[Hashable]) -> None:
+        for key in keys:
+            self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class CacheStats:
+    __slots__ = ('hits', 'misses', 'invalidations')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def export(self) -> dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'invalidations': self.invalidations}
+
+
+class ObjectCache:
+    """
+    Read-through cache of one model. Snapshots (column values) are cached, instances are rebuilt
+    in the session of the caller without a query, so cached objects are never shared between sessions.
+    """
+
+    def __init__(self, model: Type[MODEL], backend: CacheBackend):
+        self.model = model
+        self.mapper: Mapper = inspect(model)
+        self.backend = backend
+        self.stats = CacheStats()
+
+    async def get_many(self, session, pks: list[Hashable]) -> tuple[dict[Hashable, MODEL], list[Hashable]]:
+        """
+        Objects and keys to load. Objects, held by session, are taken as is, so their unflushed changes
+        are kept. Others are restored from cache and merged into session.
+        """
+        objects = self.get_held(session, pks)
+        pks = [pk for pk in pks if pk not in objects]
+        snapshots = self.backend.get_many(pks)
+        self.stats.hits += len(snapshots)
+        self.stats.misses += len(pks) - len(snapshots)
+        for pk, snapshot in snapshots.items():
+            objects[pk] = await self.restore(session, snapshot)
+        return objects, [pk for pk in pks if pk not in snapshots]
+
+    def get_held(self, session, pks: list[Hashable]) -> dict[Hashable, MODEL]:
+        """Not expired objects from identity map of session"""
+        held = {}
+        for pk in pks:
+            obj = session.identity_map.get(self.mapper.identity_key_from_primary_key([pk]))
+            if obj is not None and not inspect(obj).expired:
+                held[pk] = obj
+        return held
+
+    def set_many(self, objects: dict[Hashable, MODEL]) -> None:
+        if objects:
+            self.backend.set_many({pk: self.snapshot(obj) for pk, obj in objects.items()})
+
+    def can_store(self, session) -> bool:
+        """Rows, read by transaction, that changed the table, may be not committed yet"""
+        return self not in session.sync_session.info.get('object_cache_pending', {})
+
+    def invalidate(self, pks: list[Hashable]) -> None:
+        self.stats.invalidations += len(pks)
+        self.backend.delete_many(pks)
+
+    def clear(self) -> None:
+        self.stats.invalidations += 1
+        self.backend.clear()
+
+    def snapshot(self, obj: MODEL) -> dict[str, Any]:
+        state = inspect(obj)
+        return {attr.key: state.dict[attr.key] for attr in self.mapper.column_attrs if attr.key in state.dict}
+
+    async def restore(self, session, snapshot: dict[str, Any]) -> MODEL:
+        obj = self.mapper.class_manager.new_instance()
+        for key, value in snapshot.items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        return await session.merge(obj, load=False)
+
+
+_caches: dict[str, ObjectCache] = {}
+
+
+def get_object_cache(model: Type[MODEL], backend_cls: Type[CacheBackend]) -> ObjectCache:
+    name = model.__table__.fullname
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches[name] = ObjectCache(model=model, backend=backend_cls())
+    return cache
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """Counters of all object caches for monitoring"""
+    return {name: cache.stats.export() for name, cache in _caches.items()}
+
+
+def _find_cache(table: Table | None) -> ObjectCache | None:
+    return None if table is None else _caches.get(table.fullname)
+
+
+def _invalidate(session: Session, cache: ObjectCache, pks: list[Hashable] = None) -> None:
+    """Drop now and remember to drop once more after commit, when change becomes visible to other sessions"""
+    pending: dict[ObjectCache, set | None] = session.info.setdefault('object_cache_pending', {})
+    if pks is None:
+        cache.clear()
+        pending[cache] = None
+    else:
+        cache.invalidate(pks)
+        if cache not in pending:
+            pending[cache] = set()
+        if pending[cache] is not None:
+            pending[cache].update(pks)
+
+
+@event.listens_for(Session, 'after_flush')
+def _invalidate_flushed(session: Session, _) -> None:
+    for obj in (*session.dirty, *session.deleted):
+        cache = _find_cache(getattr(type(obj), '__table__', None))
+        identity = inspect(obj).identity
+        if cache is not None and identity is not None and len(identity) == 1:
+            _invalidate(session, cache, [identity[0]])
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session: Session) -> None:
+    for cache, pks in session.info.pop('object_cache_pending', {}).items():
+        if pks is None:
+            cache.clear()
+        else:
+            cache.invalidate(list(pks))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_pending(session: Session) -> None:
+    session.info.pop('object_cache_pending', None)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _invalidate_statements(state: ORMExecuteState) -> None:
+    """Bulk UPDATE / DELETE / INSERT ... ON CONFLICT change rows, which keys are unknown before execution"""
+    if not (state.is_update or state.is_delete or state.is_insert):
+        return
+    statement = state.statement
+    if state.is_insert and not (isinstance(statement, PgInsert) and statement._post_values_clause is not None):
+        return
+    cache = _find_cache(getattr(statement, 'table', None))
+    if cache is not None:
+        _invalidate(state.session, cache)
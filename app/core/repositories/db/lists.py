@@ -1,8 +1,258 @@
+from difflib import SequenceMatcher
+from typing import Any, NamedTuple
+
+from sqlalchemy import select, update, delete, values, column, func
+from sqlalchemy.dialects.postgresql import insert
+
+from core.constants import EMPTY
+from core.db.connection import AsyncSession
+from core.types import PK
+from core.utils import chunked
+from core.validators import ListValidator
+from ._rows import SaRowsMixin, MAX_QUERY_PARAMS, any_of
 from .._base import AbstractListRepository
 
 
-__all__ = ["SaListRepository"]
+__all__ = ["SaListRepository", "ListSyncResult"]
+
+# key of stored row number in data of UPDATE ... FROM VALUES
+_OLD_RN = '__old_rn__'
+
+
+class ListSyncResult(NamedTuple):
+    inserted: int
+    updated: int
+    deleted: int
+    moved: int
+
+
+class SaListRepository(SaRowsMixin, AbstractListRepository):
+    validator_cls = ListValidator
+
+    def __init__(self, context: dict[str, Any], owner: Any):
+        super().__init__(context=context, owner=owner)
+        self.session: AsyncSession = self.context['session']
+
+    @property
+    def owner_pk(self) -> PK:
+        assert self.owner.instance is not None, 'List repository requires owner with instance'
+        return getattr(self.owner.instance, self.owner.schema.primary_key)
+
+    @property
+    def rn_gap(self) -> int:
+        return self.model.__RN_GAP__
+
+    async def get(self, **kwargs) -> list[Any]:
+        query = select(self.model).where(self.model.owner_id == self.owner_pk).order_by(self.model.rn)
+        return list(await self.session.scalars(query))
+
+    async def get_many(self, owner_pks: list[PK]) -> dict[PK, list[Any]]:
+        """
+        Rows of many owners by one query. Every owner gets a list, even empty one.
+        """
+        owner_pks = list(dict.fromkeys(owner_pks))
+        result: dict[PK, list[Any]] = {pk: [] for pk in owner_pks}
+        if not owner_pks:
+            return result
+        query = (
+            select(self.model)
+            .where(any_of(self.model.owner_id, owner_pks))
+            .order_by(self.model.owner_id, self.model.rn)
+        )
+        for row in await self.session.scalars(query):
+            result[row.owner_id].append(row)
+        return result
+
+    async def get_numbered(self) -> list[tuple[int, Any]]:
+        """Rows with their positions 1..N, which are independent of stored (possibly sparse) numbers"""
+        return list(enumerate(await self.get(), start=1))
+
+    async def add(self, data: list[dict[str, Any]], chunk_size: int = None) -> None:
+        """Rows are appended after the last stored row"""
+        rows = await self._prepare_rows(await self.validator.validate_list(data))
+        last_rn = await self.session.scalar(
+            select(func.coalesce(func.max(self.model.rn), 0)).where(self.model.owner_id == self.owner_pk)
+        )
+        owner_pk, gap = self.owner_pk, self.rn_gap
+        await self._insert_rows(
+            [{**row, 'rn': last_rn + gap * idx, 'owner_id': owner_pk} for idx, row in enumerate(rows, start=1)],
+            chunk_size=chunk_size,
+        )
+
+    async def add_row(self, data: dict[str, Any], position: int = None) -> None:
+        """Row is inserted at position 1..N+1 or appended"""
+        if position is None:
+            return await self.add([data])
+        row = (await self._prepare_rows(await self.validator.validate_list([data])))[0]
+        rns = await self._get_rns()
+        if not 1 <= position <= len(rns) + 1:
+            raise ValueError(f'Position {position} is out of range 1..{len(rns) + 1}')
+        rn, renumbering = self._make_room(rns, position - 1)
+        await self._renumber(renumbering)
+        await self._insert_rows([{**row, 'rn': rn, 'owner_id': self.owner_pk}])
+
+    async def move_row(self, position: int, to_position: int) -> None:
+        """
+        Row at position is moved, so it gets to_position. Sparse lists change only moved row,
+        in dense lists rows between positions are shifted by one, so numbers stay 1..N.
+        """
+        rns = await self._get_rns()
+        if not (1 <= position <= len(rns) and 1 <= to_position <= len(rns)):
+            raise ValueError(f'Positions {position}, {to_position} are out of range 1..{len(rns)}')
+        if position == to_position:
+            return
+        old_rn = rns.pop(position - 1)
+        if self.rn_gap == 1:
+            rns.insert(to_position - 1, old_rn)
+            return await self._renumber({rn: idx for idx, rn in enumerate(rns, start=1)})
+        rn, renumbering = self._make_room(rns, to_position - 1)
+        await self._renumber({**renumbering, old_rn: rn})
+
+    async def rebalance(self) -> None:
+        """
+        Rows get numbers with equal gaps. Inserts rebalance only when gap is exhausted,
+        so it can be run periodically for lists with frequent inserts into the same place.
+        """
+        await self._renumber({rn: self.rn_gap * idx for idx, rn in enumerate(await self._get_rns(), start=1)})
+
+    async def clear(self) -> None:
+        await self.session.execute(delete(self.model).where(self.model.owner_id == self.owner_pk))
+
+    async def sync(self, data: list[dict[str, Any]], chunk_size: int = None) -> ListSyncResult:
+        """
+        Stored rows become data with the minimal set of writes. Rows are matched by values, so unchanged rows
+        aren't written, changed rows are updated in place and only rows, which got other number, are renumbered.
+        """
+        rows = await self._prepare_rows(await self.validator.validate_list(data))
+        owner_pk = self.owner_pk
+        table_columns = self.model.__table__.c
+        keys = sorted({k for row in rows for k in row})
+        stored = (await self.session.execute(
+            select(self.model.rn, *(table_columns[k] for k in keys))
+            .where(self.model.owner_id == owner_pk)
+            .order_by(self.model.rn)
+        )).all()
+
+        old_rns = [r[0] for r in stored]
+        matcher = SequenceMatcher(
+            None,
+            [tuple(r[1:]) for r in stored],
+            [tuple(row.get(k, EMPTY) for k in keys) for row in rows],
+            autojunk=False,
+        )
+        # stored row and whether it's changed for every new row; None - row is new
+        matched: list[tuple[int, bool] | None] = [None] * len(rows)
+        to_delete, to_update, to_insert = [], [], []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            paired = min(i2 - i1, j2 - j1)
+            for i, j in zip(range(i1, i1 + paired), range(j1, j1 + paired)):
+                matched[j] = (old_rns[i], tag != 'equal')
+            to_delete.extend(old_rns[i1 + paired:i2])
+
+        targets = self._assign_rns([m and m[0] for m in matched])
+        updated = moved = 0
+        for j, (m, rn) in enumerate(zip(matched, targets)):
+            if m is None:
+                to_insert.append({**rows[j], 'rn': rn, 'owner_id': owner_pk})
+                continue
+            old_rn, changed = m
+            if not changed and old_rn == rn:
+                continue
+            row = {_OLD_RN: old_rn}
+            if old_rn != rn:
+                row['rn'] = -rn
+                moved += 1
+            if changed:
+                row.update(rows[j])
+                updated += 1
+            to_update.append(row)
+
+        for chunk in chunked(to_delete, MAX_QUERY_PARAMS - 1):
+            await self.session.execute(
+                delete(self.model).where(self.model.owner_id == owner_pk, self.model.rn.in_(chunk))
+            )
+        await self._write_updates(to_update, chunk_size=chunk_size)
+        await self._insert_rows(to_insert, chunk_size=chunk_size)
+        return ListSyncResult(inserted=len(to_insert), updated=updated, deleted=len(to_delete), moved=moved)
+
+    async def _get_rns(self) -> list[int]:
+        query = select(self.model.rn).where(self.model.owner_id == self.owner_pk).order_by(self.model.rn)
+        return list(await self.session.scalars(query))
+
+    def _assign_rns(self, kept: list[int | None]) -> list[int]:
+        """
+        Numbers of rows in order, where kept are numbers of stored rows (None for new). Dense lists are numbered
+        from 1. Sparse lists keep numbers of stored rows and new rows take numbers from the gaps between them,
+        if some gap is too small, all rows are renumbered.
+        """
+        gap = self.rn_gap
+        if gap == 1:
+            return list(range(1, len(kept) + 1))
+        targets, lo, new_count = [], 0, 0
+        for rn in [*kept, EMPTY]:
+            if rn is None:
+                new_count += 1
+                continue
+            if new_count:
+                if rn is EMPTY:
+                    targets.extend(lo + gap * k for k in range(1, new_count + 1))
+                elif rn - lo > new_count:
+                    targets.extend(lo + (rn - lo) * k // (new_count + 1) for k in range(1, new_count + 1))
+                else:
+                    return [gap * k for k in range(1, len(kept) + 1)]
+                new_count = 0
+            if rn is not EMPTY:
+                targets.append(rn)
+                lo = rn
+        return targets
+
+    def _make_room(self, rns: list[int], idx: int) -> tuple[int, dict[int, int]]:
+        """
+        Number for a row before rns[idx] and renumbering of stored rows, which is required for it.
+        Dense lists are renumbered to 1..N (only shifted rows actually change), sparse take the middle of the gap.
+        """
+        gap = self.rn_gap
+        if gap == 1:
+            return idx + 1, {rn: i + 1 + (i >= idx) for i, rn in enumerate(rns)}
+        lo = rns[idx - 1] if idx > 0 else 0
+        if idx == len(rns):
+            return lo + gap, {}
+        hi = rns[idx]
+        if hi - lo > 1:
+            return (lo + hi) // 2, {}
+        return gap * (idx + 1), {rn: gap * (i + 1 + (i >= idx)) for i, rn in enumerate(rns)}
+
+    async def _renumber(self, renumbering: dict[int, int]) -> None:
+        await self._write_updates([{_OLD_RN: old, 'rn': -new} for old, new in renumbering.items() if old != new])
+
+    async def _write_updates(self, rows: list[dict[str, Any]], chunk_size: int = None) -> None:
+        """
+        Rows, which get other number, are moved to negative numbers first and flipped back by one statement,
+        so new numbers never collide with stored ones (primary key is checked row by row).
+        """
+        for keys, chunk in self._iter_chunks(rows, chunk_size):
+            await self._update_chunk(keys, chunk)
+        if any('rn' in row for row in rows):
+            await self.session.execute(
+                update(self.model)
+                .where(self.model.owner_id == self.owner_pk, self.model.rn < 0)
+                .values(rn=-self.model.rn),
+                execution_options={'synchronize_session': False},
+            )
 
+    async def _insert_rows(self, rows: list[dict[str, Any]], chunk_size: int = None) -> None:
+        for _, chunk in self._iter_chunks(rows, chunk_size):
+            await self.session.execute(insert(self.model).values(chunk))
 
-class SaListRepository(AbstractListRepository):
-    pass
+    async def _update_chunk(self, keys: tuple[str, ...], chunk: list[dict[str, Any]]) -> None:
+        table_columns = self.model.__table__.c
+        data = values(
+            *(column(k, table_columns['rn' if k == _OLD_RN else k].type) for k in keys),
+            name='list_data',
+        ).data([tuple(row[k] for k in keys) for row in chunk])
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.owner_id == self.owner_pk, self.model.rn == data.c[_OLD_RN])
+            .values({k: data.c[k] for k in keys if k != _OLD_RN}),
+            execution_options={'synchronize_session': False},
+        )
@@ -0,0 +1,75 @@
+from typing import Any, Callable, Type
+
+from sqlalchemy import select, delete, literal, ClauseElement, ColumnElement, Insert, Delete
+from sqlalchemy.dialects.postgresql import insert
+
+from core.db import DOCUMENT, LIST_MODEL, REGISTER
+from core.types import PK
+from ._rows import any_of
+
+
+__all__ = ["Movement"]
+
+MovementValues = Callable[[Type[DOCUMENT], Type[LIST_MODEL] | None], dict[str, ColumnElement]]
+MovementWhere = Callable[[Type[DOCUMENT], Type[LIST_MODEL] | None], ColumnElement[bool]]
+
+
+class Movement:
+    """
+    Declaration of document movements into accumulation register: one register row per row of list
+    (or one per document, if list isn't set). Values of dimensions and resources are sql expressions
+    over document and list models (or constants), so movements of any number of documents are written by one INSERT ... SELECT.
+
+        Movement(StockRegister, list_name='items', values=lambda doc, row: {
+            'warehouse_id': doc.warehouse_id, 'product_id': row.product_id, 'quantity': -row.quantity,
+        })
+    """
+
+    def __init__(
+            self,
+            register: Type[REGISTER],
+            values: MovementValues,
+            list_name: str = None,
+            where: MovementWhere = None,
+    ):
+        self.register = register
+        self.values = values
+        self.list_name = list_name
+        self.where = where
+
+    def insert(self, document: Type[DOCUMENT], pks: list[PK], number: int) -> Insert:
+        row = None if self.list_name is None else document.get_list_model(self.list_name)
+        values = self.values(document, row)
+        missing = {*self.register.__DIMENSIONS__, *self.register.__RESOURCES__} - set(values)
+        if missing:
+            raise ValueError(f'Movement into "{self.register.__full_name__}" has no values for {sorted(missing)}')
+        columns = {
+            'recorder_id': document.id,
+            'movement': number,
+            'line_no': 0 if row is None else row.rn,
+            'period': document.dt,
+            **values,
+        }
+        query = (
+            select(*(self._expr(name, value).label(name) for name, value in columns.items()))
+            .where(any_of(document.id, pks))
+        )
+        if row is not None:
+            query = query.join_from(document, row, row.owner_id == document.id)
+        if self.where is not None:
+            query = query.where(self.where(document, row))
+        return insert(self.register).from_select(list(columns), query)
+
+    def _expr(self, name: str, value: Any) -> ColumnElement:
+        """Constants are allowed as values, they are bound with type of register column"""
+        if isinstance(value, ClauseElement) or hasattr(value, '__clause_element__'):
+            return value
+        return literal(value, self.register.__table__.c[name].type)
+
+    @staticmethod
+    def delete(register: Type[REGISTER], pks: list[PK]) -> Delete:
+        return delete(register).where(any_of(register.recorder_id, pks))
+
+    @staticmethod
+    def registers(movements: list["Movement"]) -> list[Type[REGISTER]]:
+        return list(dict.fromkeys(movement.register for movement in movements))
@@ -1,29 +1,58 @@
-from typing import Any, Type
+from typing import Any, AsyncIterable, ClassVar, Type, Iterable
 
-from sqlalchemy import select
+from sqlalchemy import select, update, values, column, Select, ColumnElement
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm.attributes import set_committed_value
 
+from core.constants import EMPTY
 from core.types import PK
-from core.db import OBJECT, DIRECTORY, DOCUMENT
+from core.db import OBJECT, DIRECTORY, DOCUMENT, CopyLoader
 from core.db.connection import AsyncSession
+from core.settings import settings
+from core.utils import chunked
 from core.schema import O_SCH, DIR_SCH, DOC_SCH, get_default_app_schema
-from core.validators import ObjectValidator, O_VAL, DirectoryValidator, DIR_VAL, DocumentValidator, DOC_VAL
+from core.smart_queries import SaSmartQuery, KeysetPage
+from core.validators import (
+    ObjectValidator, O_VAL, DirectoryValidator, DIR_VAL, DocumentValidator, DOC_VAL, UniqueScope,
+)
+from core.validators.exceptions import ListErrors, ObjectErrors, NotFound, NotUnique
+from .cache import CacheBackend, ObjectCache, get_object_cache
 from .lists import SaListRepository
+from .balances import RegisterBalances
+from .movements import Movement
+from ._rows import SaRowsMixin, any_of
 from .._base import AbstractObjectRepository, O_REP
 from ..exceptions import ObjectNotFoundError
+from ..identity import IdentityMap, get_identity_map
 
 
 __all__ = ["SaObjectRepository", "SaDirectoryRepository", "SaDocumentRepository"]
 
-
-
-class SaObjectRepository(AbstractObjectRepository[OBJECT, O_SCH, O_VAL]):
+class SaObjectRepository(SaRowsMixin, AbstractObjectRepository[OBJECT, O_SCH, O_VAL]):
     validator_cls = ObjectValidator
+    smart_query_cls: Type[SaSmartQuery] = SaSmartQuery
     DEFAULT_LIST_REPOSITORY_CLS = SaListRepository
 
+    # opt-in cross-request cache, e.g. object_cache_backend = MemoryCacheBackend
+    object_cache_backend: Type[CacheBackend] | None = None
+    object_cache: ObjectCache | None = None
+
     def __init__(self, context: dict[str, Any]):
         super().__init__(context=context)
         self.session: AsyncSession = self.context['session']
 
+    def __init_subclass__(cls, schema: O_SCH = None) -> None:
+        super().__init_subclass__(schema=schema)
+        if schema is None:
+            return
+        cls.smart_query_cls = cls.smart_query_cls.bind(model=cls.model, schema=schema)
+        if cls.object_cache_backend is not None:
+            cls.object_cache = get_object_cache(model=cls.model, backend_cls=cls.object_cache_backend)
+
+    @property
+    def smart_query(self) -> SaSmartQuery:
+        return self.smart_query_cls(session=self.session)
+
     @classmethod
     def _get_list_model(cls, name: str) -> Any:
         return cls.model.get_list_model(name)
@@ -38,19 +67,307 @@ class SaObjectRepository(AbstractObjectRepository[OBJECT, O_SCH, O_VAL]):
     def get_pk_attr(self):
         return getattr(self.model, self.schema.primary_key)
 
-    async def get(self, **kwargs): ...
+    async def get(
+            self,
+            filters: dict[str, Any] = None,
+            sort: list[str] = None,
+            include: dict[str, Any] = None,
+            limit: int = None,
+            **kwargs,
+    ) -> list[OBJECT]:
+        return await self.smart_query.get(filters=filters, sort=sort, include=include, limit=limit)
+
+    async def get_page(
+            self,
+            filters: dict[str, Any] = None,
+            sort: list[str] = None,
+            include: dict[str, Any] = None,
+            *,
+            limit: int,
+            cursor: str = None,
+    ) -> KeysetPage[OBJECT]:
+        return await self.smart_query.get_page(filters=filters, sort=sort, include=include, limit=limit, cursor=cursor)
+
+    @property
+    def identity_map(self) -> IdentityMap:
+        return get_identity_map(self.context)
 
     async def get_many(self, pks: list[PK], **kwargs) -> dict[PK, OBJECT]:
-        result = await self.session.scalars(select(self.model).where(self.get_pk_attr().in_(pks)))
+        """Only keys, that were not looked up in this context yet, are loaded"""
+        name = self.schema.full_name
+        known, unknown = self.identity_map.split(name, list(dict.fromkeys(pks)))
+        if unknown:
+            loaded = await self._load(unknown)
+            self.identity_map.add_many(name, {pk: loaded.get(pk) for pk in unknown})
+            known.update(loaded)
+        return {pk: obj for pk, obj in known.items() if obj is not None}
+
+    async def get_lists(self, pks: list[PK], names: list[str] = None) -> dict[str, dict[PK, list[Any]]]:
+        """Rows of lists (all by default) by owner, one query per list"""
+        names = list(self.list_cls_map) if names is None else names
+        return {name: await self.list_repository(name).get_many(pks) for name in names}
+
+    async def load_lists(self, objects: Iterable[OBJECT], names: list[str] = None) -> None:
+        """Lists of many objects are loaded at once and set to their relationships, so they aren't lazy loaded"""
         pk_attr = self.schema.primary_key
-        return {getattr(obj, pk_attr): obj for obj in result}
+        objects = {getattr(obj, pk_attr): obj for obj in objects}
+        for name, rows_by_owner in (await self.get_lists(list(objects), names)).items():
+            for pk, obj in objects.items():
+                set_committed_value(obj, name, rows_by_owner[pk])
 
     async def get_one(self, pk: PK, raise_if_none: bool = True, **kwargs) -> OBJECT | None:
-        result = await self.session.scalar(select(self.model).where(self.get_pk_attr() == pk))
+        name = self.schema.full_name
+        result = self.identity_map.get(name, pk)
+        if result is EMPTY:
+            result = (await self._load([pk])).get(pk)
+            self.identity_map.add(name, pk, result)
         if result is None and raise_if_none:
             raise ObjectNotFoundError
         return result
 
+    async def _load(self, pks: list[PK]) -> dict[PK, OBJECT]:
+        """Read through object cache, if repository has it"""
+        found = {}
+        if self.object_cache is not None:
+            found, pks = await self.object_cache.get_many(self.session, pks)
+        if pks:
+            query = select(self.model).where(self.get_pk_attr() == pks[0] if len(pks) == 1 else self.get_pk_attr().in_(pks))
+            pk_attr = self.schema.primary_key
+            loaded = {getattr(obj, pk_attr): obj for obj in await self.session.scalars(query)}
+            if self.object_cache is not None and self.object_cache.can_store(self.session):
+                self.object_cache.set_many(loaded)
+            found.update(loaded)
+        return found
+
+    def _unique_expression(self, attr_name: str) -> ColumnElement:
+        """Expression, which values must be unique. Override with _unique_key for e.g. case-insensitive unique"""
+        return getattr(self.model, attr_name)
+
+    def _unique_key(self, attr_name: str, value: Any) -> Any:
+        """Value as it is compared with _unique_expression"""
+        return value
+
+    def _check_unique_whereclause(self, attr_name: str, value: Any) -> ColumnElement[bool]:
+        return self._unique_expression(attr_name) == self._unique_key(attr_name, value)
+
+    def _modify_check_unique_query[S: Select](self, query: S, attr_name: str) -> S:
+        if self.instance is not None:
+            query = query.where(self.get_pk_attr() != getattr(self.instance, self.schema.primary_key))
+        return query
+
+    async def is_unique(self, attr_name: str, value: Any) -> bool:
+        query = select(self.model).where(self._check_unique_whereclause(attr_name=attr_name, value=value))
+        query = self._modify_check_unique_query(query, attr_name)
+        return not await self.session.scalar(select(query.exists()))
+
+    async def is_unique_attrs(self, values: dict[str, Any]) -> dict[str, bool]:
+        """Unique flags of several attrs of one object by one query of EXISTS per attr"""
+        checks = {}
+        for attr_name, value in values.items():
+            query = select(self.model).where(self._check_unique_whereclause(attr_name=attr_name, value=value))
+            checks[attr_name] = self._modify_check_unique_query(query, attr_name).exists().label(attr_name)
+        if not checks:
+            return {}
+        row = (await self.session.execute(select(*checks.values()))).one()
+        return {attr_name: not taken for attr_name, taken in zip(checks, row)}
+
+    async def is_unique_many(self, attr_name: str, values: list[Any], scope: UniqueScope = None) -> list[bool]:
+        """
+        Unique flags for values, one IN query per chunk instead of query per value.
+        Value repeating previous one of the batch is not unique too.
+        With scope.pks value may equal only the stored value of its own row.
+        """
+        scope = scope or UniqueScope()
+        keys = [self._unique_key(attr_name, value) for value in values]
+        owners: dict[Any, set[PK]] = {}
+        if attr_name not in scope.skip_db:
+            expr = self._unique_expression(attr_name)
+            for chunk in chunked(list(set(keys)), settings.unique_check_chunk_size):
+                query = select(expr, self.get_pk_attr()).where(expr.in_(chunk))
+                query = self._modify_check_unique_query(query, attr_name)
+                for key, pk in await self.session.execute(query):
+                    owners.setdefault(key, set()).add(pk)
+        result = []
+        seen = set()
+        for idx, key in enumerate(keys):
+            own = None if scope.pks is None else scope.pks[idx]
+            result.append(key not in seen and not owners.get(key, set()) - {own})
+            seen.add(key)
+        return result
+
+
+    async def create_many(self, data: list[dict[str, Any]], *, chunk_size: int = None) -> dict[PK, OBJECT]:
+        """Validates all rows in list mode and inserts them by multi-row INSERT ... RETURNING per chunk"""
+        valid_data = await self.validator.validate_many(data, create=True)
+        return await self._write_rows(await self._prepare_rows(valid_data), chunk_size=chunk_size)
+
+    async def update_many(self, data: list[dict[str, Any]], *, chunk_size: int = None) -> dict[PK, OBJECT]:
+        """
+        Every row must have primary key of existing object, unknown keys are reported as NotFound.
+        Rows are written by UPDATE ... FROM (VALUES ...) RETURNING per chunk.
+        Unique value of every row is not compared with the stored value of the row itself.
+        """
+        pk_attr = self.schema.primary_key
+        assert all(pk_attr in row for row in data), f'Every row must have "{pk_attr}"'
+        pks = [row[pk_attr] for row in data]
+        await self._check_pks_exist(pks)
+        valid_data = await self.validator.validate_many(
+            [{k: v for k, v in row.items() if k != pk_attr} for row in data],
+            create=False,
+            unique_scope=UniqueScope(pks=pks),
+        )
+        rows = [{pk_attr: pk, **row} for pk, row in zip(pks, await self._prepare_rows(valid_data))]
+        result = {}
+        for keys, chunk in self._iter_chunks(rows, chunk_size):
+            if len(keys) == 1:
+                # nothing to update, but rows are still returned
+                result.update(await self.get_many([row[pk_attr] for row in chunk]))
+                continue
+            result.update(await self._update_chunk(keys, chunk))
+        self.identity_map.add_many(self.schema.full_name, result)
+        return result
+
+    async def upsert_many(
+            self,
+            data: list[dict[str, Any]],
+            *,
+            conflict: list[str] = None,
+            chunk_size: int = None,
+    ) -> dict[PK, OBJECT]:
+        """
+        INSERT ... ON CONFLICT (conflict or primary key) DO UPDATE per chunk. Conflict columns are accepted
+        in rows, even if they are not available attrs (primary key), and are checked for uniqueness only
+        inside the batch, since conflicting rows are expected to exist, while the same row can't be
+        upserted twice by one statement. Other unique attrs are checked as usual.
+        """
+        pk_attr = self.schema.primary_key
+        conflict = conflict or [pk_attr]
+        extra = [k for k in conflict if k not in self.validator.available_attrs]
+        list_errors = await self._check_unique_in_batch(data, extra)
+        try:
+            valid_data = await self.validator.validate_many(
+                [{k: v for k, v in row.items() if k not in extra} for row in data],
+                create=True,
+                unique_scope=UniqueScope(pks=[row.get(pk_attr) for row in data], skip_db=frozenset(conflict)),
+            )
+        except ListErrors as errors:
+            for idx, err in errors:
+                if idx in list_errors:
+                    list_errors[idx].merge(err)
+                else:
+                    list_errors.add(idx, err=err)
+        if list_errors:
+            raise list_errors
+        rows = [
+            {**{k: data_row[k] for k in extra if k in data_row}, **row}
+            for data_row, row in zip(data, await self._prepare_rows(valid_data))
+        ]
+        return await self._write_rows(rows, chunk_size, conflict=conflict)
+
+    async def copy_many(
+            self,
+            data: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+            *,
+            conflict: list[str] = None,
+            chunk_size: int = None,
+            max_errors: int = None,
+    ) -> int:
+        """
+        Bulk load for imports: rows are streamed chunk by chunk through list validation into COPY.
+        With conflict existing rows are updated through staging table. Instances are not returned.
+        Validation errors are raised after the stream (or max_errors) with indexes of the whole stream.
+        The load runs in a savepoint, so chunks copied before the error are rolled back with it.
+        """
+        loader = CopyLoader(session=self.session, table=self.model.__table__)
+        loaded = 0
+        async with self.session.begin_nested():
+            async for valid_data in self.validator.validate_stream(
+                data,
+                create=True,
+                chunk_size=chunk_size or settings.copy_chunk_size,
+                max_errors=max_errors,
+                unique_scope=None if conflict is None else UniqueScope(skip_db=frozenset(conflict)),
+            ):
+                for _, rows in self._group_rows(await self._prepare_rows(valid_data)):
+                    loaded += await loader.copy(rows, conflict=conflict)
+        return loaded
+
+    async def _write_rows(
+            self,
+            rows: list[dict[str, Any]],
+            chunk_size: int = None,
+            conflict: list[str] = None,
+    ) -> dict[PK, OBJECT]:
+        pk_attr = self.schema.primary_key
+        result = {}
+        for keys, chunk in self._iter_chunks(rows, chunk_size):
+            query = insert(self.model).values(chunk)
+            if conflict is not None:
+                # conflict column is set to itself, if there is nothing else, so existing rows are returned too
+                update_keys = [k for k in keys if k not in conflict] or [k for k in keys if k in conflict][:1]
+                if update_keys:
+                    query = query.on_conflict_do_update(
+                        index_elements=conflict,
+                        set_={k: query.excluded[k] for k in update_keys},
+                    )
+                else:
+                    query = query.on_conflict_do_nothing(index_elements=conflict)
+            objects = await self.session.scalars(
+                query.returning(self.model),
+                execution_options={'populate_existing': True},
+            )
+            result.update({getattr(obj, pk_attr): obj for obj in objects})
+        self.identity_map.add_many(self.schema.full_name, result)
+        return result
+
+    async def _check_unique_in_batch(self, data: list[dict[str, Any]], names: list[str]) -> ListErrors:
+        """Repeated values of attrs, which are not validated (e.g. primary key as conflict column), by index"""
+        list_errors = ListErrors()
+        for name in names:
+            to_check = [idx for idx, row in enumerate(data) if row.get(name) is not None]
+            flags = await self.is_unique_many(
+                name,
+                values=[data[idx][name] for idx in to_check],
+                scope=UniqueScope(skip_db=frozenset(names)),
+            )
+            for idx, is_unique in zip(to_check, flags):
+                if is_unique:
+                    continue
+                if idx in list_errors:
+                    list_errors[idx].add(name, NotUnique)
+                else:
+                    list_errors.add(idx, err=ObjectErrors().add(name, NotUnique))
+        return list_errors
+
+    async def _check_pks_exist(self, pks: list[PK]) -> None:
+        """Rows with unknown keys are reported by index"""
+        pk_attr = self.get_pk_attr()
+        found = set(await self.session.scalars(select(pk_attr).where(any_of(pk_attr, list(set(pks))))))
+        list_errors = ListErrors()
+        for idx, pk in enumerate(pks):
+            if pk not in found:
+                list_errors.add(idx, err=ObjectErrors().add(self.schema.primary_key, NotFound))
+        if list_errors:
+            raise list_errors
+
+    async def _update_chunk(self, keys: tuple[str, ...], chunk: list[dict[str, Any]]) -> dict[PK, OBJECT]:
+        pk_attr = self.schema.primary_key
+        table_columns = self.model.__table__.c
+        data = values(*(column(k, table_columns[k].type) for k in keys), name='bulk_data').data(
+            [tuple(row[k] for k in keys) for row in chunk]
+        )
+        query = (
+            update(self.model)
+            .where(self.get_pk_attr() == data.c[pk_attr])
+            .values({k: data.c[k] for k in keys if k != pk_attr})
+            .returning(self.model)
+        )
+        objects = await self.session.scalars(
+            query,
+            execution_options={'synchronize_session': False, 'populate_existing': True},
+        )
+        return {getattr(obj, pk_attr): obj for obj in objects}
+
 
 class SaDirectoryRepository(SaObjectRepository[DIRECTORY, DIR_SCH, DIR_VAL]):
     validator_cls = DirectoryValidator
@@ -62,9 +379,14 @@ class SaDirectoryRepository(SaObjectRepository[DIRECTORY, DIR_SCH, DIR_VAL]):
     async def conduct(self) -> None:
         raise Exception('Can`t exec conduct. Available only for Document')
 
+    async def unconduct(self) -> None:
+        raise Exception('Can`t exec unconduct. Available only for Document')
+
 
 class SaDocumentRepository(SaObjectRepository[DOCUMENT, DOC_SCH, DOC_VAL]):
     validator_cls = DocumentValidator
+    # movements into accumulation registers, which are written on conducting
+    movements: ClassVar[list[Movement]] = []
 
     @classmethod
     def _find_schema(cls) -> DIR_SCH:
@@ -72,4 +394,47 @@ class SaDocumentRepository(SaObjectRepository[DOCUMENT, DOC_SCH, DOC_VAL]):
 
     async def conduct(self) -> None:
         assert self.instance
-        ...
+        await self.conduct_many([self.instance.id])
+        set_committed_value(self.instance, 'conducted', True)
+
+    async def unconduct(self) -> None:
+        assert self.instance
+        await self.unconduct_many([self.instance.id])
+        set_committed_value(self.instance, 'conducted', False)
+
+    async def conduct_many(self, pks: list[PK]) -> None:
+        """
+        Previous movements are deleted and all movements of documents are written set-based:
+        one DELETE per register and one INSERT ... SELECT per movement declaration, both update register totals.
+        """
+        pks = list(dict.fromkeys(pks))
+        await self._delete_movements(pks)
+        for number, movement in enumerate(self.movements):
+            await self.session.execute(
+                RegisterBalances.with_totals(movement.register, movement.insert(self.model, pks, number), sign=1)
+            )
+        await self._invalidate_snapshots(pks)
+        await self._set_conducted(pks, True)
+
+    async def unconduct_many(self, pks: list[PK]) -> None:
+        pks = list(dict.fromkeys(pks))
+        await self._delete_movements(pks)
+        await self._set_conducted(pks, False)
+
+    async def _delete_movements(self, pks: list[PK]) -> None:
+        """Totals of registers are decreased by deleted movements"""
+        await self._invalidate_snapshots(pks)
+        for register in Movement.registers(self.movements):
+            await self.session.execute(RegisterBalances.with_totals(register, Movement.delete(register, pks), sign=-1))
+
+    async def _invalidate_snapshots(self, pks: list[PK]) -> None:
+        for register in Movement.registers(self.movements):
+            query = RegisterBalances.invalidate_snapshots(register, pks)
+            if query is not None:
+                await self.session.execute(query)
+
+    async def _set_conducted(self, pks: list[PK], conducted: bool) -> None:
+        await self.session.execute(
+            update(self.model).where(any_of(self.model.id, pks)).values(conducted=conducted),
+            execution_options={'synchronize_session': False},
+        )
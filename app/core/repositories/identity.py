@@ -0,0 +1,57 @@
+from typing import Any, Hashable
+
+from core.constants import EMPTY
+
+
+__all__ = ["IdentityMap", "get_identity_map"]
+
+
+IDENTITY_MAP_KEY = 'identity_map'
+
+
+class IdentityMap:
+    """
+    Objects loaded during one context (request), keyed by model full name and primary key.
+    Missing objects are remembered as None, so repeated lookups of absent keys don't query again.
+    """
+
+    def __init__(self):
+        self._objects: dict[tuple[str, Hashable], Any] = {}
+
+    def get(self, name: str, pk: Hashable, default: Any = EMPTY) -> Any:
+        return self._objects.get((name, pk), default)
+
+    def add(self, name: str, pk: Hashable, obj: Any) -> None:
+        self._objects[(name, pk)] = obj
+
+    def add_many(self, name: str, objects: dict[Hashable, Any]) -> None:
+        for pk, obj in objects.items():
+            self._objects[(name, pk)] = obj
+
+    def discard(self, name: str, pk: Hashable) -> None:
+        self._objects.pop((name, pk), None)
+
+    def split(self, name: str, pks: list[Hashable]) -> tuple[dict[Hashable, Any], list[Hashable]]:
+        """Known objects (not found ones included as None) and keys, that were never looked up"""
+        known, unknown = {}, []
+        for pk in pks:
+            obj = self._objects.get((name, pk), EMPTY)
+            if obj is EMPTY:
+                unknown.append(pk)
+            else:
+                known[pk] = obj
+        return known, unknown
+
+    def clear(self) -> None:
+        self._objects.clear()
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+
+def get_identity_map(context: dict[str, Any]) -> IdentityMap:
+    """Identity map shared by all repositories, created with the same context"""
+    identity_map = context.get(IDENTITY_MAP_KEY)
+    if identity_map is None:
+        identity_map = context[IDENTITY_MAP_KEY] = IdentityMap()
+    return identity_map
@@ -18,6 +18,9 @@ def register(variant: str = DEFAULT_REPOSITORY_KEY):
         comb = (repository.schema.full_name, variant)
         assert comb not in _repositories, f'Duplicate repository "{comb}"'
         _repositories[comb] = repository
+        # fill relation tables of this and earlier registered repositories, which refer to it
+        for rep in _repositories.values():
+            rep.resolve_all_related()
         return repository
     return wrapper
 
@@ -4,3 +4,5 @@ from .enums import *
 from .models import *
 from .app import *
 from .attrs import *
+from .snapshot import *
+from .serialized import *
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from core.settings import settings
 from core.utils import import_string
@@ -20,59 +20,83 @@ class AppSchema(BaseModel):
     directories: list[DIR_SCH] = Field(default_factory=list)
     documents: list[DOC_SCH] = Field(default_factory=list)
 
+    _index: dict[str, dict[str, BaseModel]] = PrivateAttr(default_factory=dict)
+
+    def _get_index(self, kind: str) -> dict[str, BaseModel]:
+        """Name index of enums, directories or documents. Rebuilt, if list was changed bypassing add_*"""
+        items = getattr(self, kind)
+        index = self._index.get(kind)
+        if index is None or len(index) != len(items):
+            index = self._index[kind] = {item.name: item for item in items}
+        return index
+
+    def _add(self, kind: str, schema: BaseModel) -> None:
+        index = self._get_index(kind)
+        assert schema.name not in index
+        getattr(self, kind).append(schema)
+        index[schema.name] = schema
+
     def add_enum(self, schema: ENUM_SCH):
         assert isinstance(schema, EnumSchema)
-        assert not list(filter(lambda sch: sch.name == schema.name, self.enums))
-        self.enums.append(schema)
+        self._add('enums', schema)
 
     def add_directory(self, schema: DIR_SCH):
         assert isinstance(schema, DirectorySchema)
-        assert not list(filter(lambda sch: sch.name == schema.name, self.directories))
-        self.directories.append(schema)
+        self._add('directories', schema)
 
     def add_document(self, schema: DOC_SCH):
         assert isinstance(schema, DocumentSchema)
-        assert not list(filter(lambda sch: sch.name == schema.name, self.documents))
-        self.documents.append(schema)
+        self._add('documents', schema)
 
     def get_reference(self, reference: str):
         t, _, name = reference.partition('.')
         match t:
             case 'enum':
                 return self.get_enum(name)
-            case 'directory':
+            case 'directory' | 'directories':
                 return self.get_directory(name)
-            case 'document':
+            case 'document' | 'documents':
                 return self.get_document(name)
 
     def get_enum(self, name: str) -> ENUM_SCH:
-        for e in self.enums:
-            if e.name == name:
-                return e
-        raise ValueError(f'Enum with name "{name}" does not exist')
+        try:
+            return self._get_index('enums')[name]
+        except KeyError:
+            raise ValueError(f'Enum with name "{name}" does not exist')
 
     def get_directory(self, name: str) -> DIR_SCH:
-        for d in self.directories:
-            if d.name == name:
-                return d
-        raise ValueError(f'Directory with name "{name}" does not exist')
+        try:
+            return self._get_index('directories')[name]
+        except KeyError:
+            raise ValueError(f'Directory with name "{name}" does not exist')
 
     def get_document(self, name: str) -> DOC_SCH:
-        for d in self.documents:
-            if d.name == name:
-                return d
-        raise ValueError(f'Document with name "{name}" does not exist')
+        try:
+            return self._get_index('documents')[name]
+        except KeyError:
+            raise ValueError(f'Document with name "{name}" does not exist')
 
 
 _default_app_schema = None
 
 
 def create_default_app_schema():
+    """Loaded from snapshot, if it was made from the same model definitions, otherwise generated and saved"""
+    from .snapshot import get_schema_key, get_snapshot_path, load_snapshot, save_snapshot
+
     global _default_app_schema
     assert _default_app_schema is None
+    path = get_snapshot_path()
+    if path is not None:
+        key = get_schema_key()
+        _default_app_schema = load_snapshot(path, key)
+        if _default_app_schema is not None:
+            return
     _default_app_schema = AppSchema(info=AppInfo(version=settings.app.VERSION))
     for collector in settings.schema_collectors:
         import_string(collector)(app_schema=_default_app_schema).collect()
+    if path is not None:
+        save_snapshot(path, _default_app_schema, key)
 
 
 def get_default_app_schema() -> AppSchema:
@@ -1,11 +1,11 @@
 from typing import TypeVar, ClassVar, TYPE_CHECKING
 
-from pydantic import BaseModel, computed_field
+from pydantic import BaseModel, computed_field, PrivateAttr
 
 from .._types import Attrs
 
 
-__all__ = ["AttrSchema", "A_SCH"]
+__all__ = ["AttrSchema", "A_SCH", "AttrsContainer"]
 
 
 class AttrSchema(BaseModel):
@@ -20,3 +20,45 @@ class AttrSchema(BaseModel):
 
 
 A_SCH = TypeVar("A_SCH", bound=AttrSchema)
+
+
+class AttrsIndex:
+    __slots__ = ('size', 'by_name', 'by_kind')
+
+    def __init__(self, attrs: list[AttrSchema]):
+        self.size = len(attrs)
+        self.by_name: dict[str, AttrSchema] = {}
+        self.by_kind: dict[Attrs, list[AttrSchema]] = {kind: [] for kind in Attrs}
+        for attr in attrs:
+            self.add(attr)
+
+    def add(self, attr: AttrSchema) -> None:
+        self.by_name[attr.name] = attr
+        self.by_kind[attr.attr].append(attr)
+
+
+class AttrsContainer(BaseModel):
+    """
+    Schema with attrs field. Attrs are indexed by name and partitioned by kind once, so lookups are dict hits.
+    Index is rebuilt, if attrs list was changed bypassing add_attr. Returned lists must not be mutated.
+    """
+    _attrs_index: AttrsIndex | None = PrivateAttr(default=None)
+
+    def _get_attrs_index(self) -> AttrsIndex:
+        index = self._attrs_index
+        if index is None or index.size != len(self.attrs):
+            index = self._attrs_index = AttrsIndex(self.attrs)
+        return index
+
+    def add_attr(self, attr: AttrSchema) -> None:
+        index = self._get_attrs_index()
+        assert attr.name not in index.by_name, f'Attr "{attr.name}" already exists'
+        self.attrs.append(attr)
+        index.add(attr)
+        index.size += 1
+
+    def get_attr(self, name: str) -> AttrSchema | None:
+        return self._get_attrs_index().by_name.get(name)
+
+    def get_attrs(self, kind: Attrs) -> list[AttrSchema]:
+        return self._get_attrs_index().by_kind[kind]
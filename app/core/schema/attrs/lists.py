@@ -1,6 +1,6 @@
 from typing import ClassVar, TypeVar
 
-from ._base import AttrSchema, A_SCH
+from ._base import AttrSchema, A_SCH, AttrsContainer
 from .columns import COL_SCH
 from .relations import REL_SCH
 from .composites import COMP_SCH
@@ -11,22 +11,22 @@ from .._types import Attrs
 __all__ = ["ListSchema", "LIST_SCH"]
 
 
-class ListSchema(AttrSchema):
+class ListSchema(AttrSchema, AttrsContainer):
     _attr: ClassVar[Attrs] = Attrs.LIST
 
     attrs: list[A_SCH]
 
     def get_columns(self) -> list[COL_SCH]:
-        return list(filter(lambda a: a.attr == Attrs.COLUMN, self.attrs))
+        return self.get_attrs(Attrs.COLUMN)
 
     def get_relations(self) -> list[REL_SCH]:
-        return list(filter(lambda a: a.attr == Attrs.RELATION, self.attrs))
+        return self.get_attrs(Attrs.RELATION)
 
     def get_composites(self) -> list[COMP_SCH]:
-        return list(filter(lambda a: a.attr == Attrs.COMPOSITE, self.attrs))
+        return self.get_attrs(Attrs.COMPOSITE)
 
     def get_properties(self) -> list[PROP_SCH]:
-        return list(filter(lambda a: a.attr == Attrs.PROPERTY, self.attrs))
+        return self.get_attrs(Attrs.PROPERTY)
 
 
 LIST_SCH = TypeVar('LIST_SCH', bound=ListSchema)
@@ -1,8 +1,6 @@
 from typing import TypeVar, ClassVar
 
-from pydantic import BaseModel
-
-from .attrs import A_SCH, COL_SCH, REL_SCH, COMP_SCH, PROP_SCH, LIST_SCH
+from .attrs import AttrsContainer, A_SCH, COL_SCH, REL_SCH, COMP_SCH, PROP_SCH, LIST_SCH
 from ._types import Attrs
 
 
@@ -12,28 +10,23 @@ __all__ = [
 ]
 
 
-class ModelSchema(BaseModel):
+class ModelSchema(AttrsContainer):
     namespace: ClassVar[str]
     name: str
     primary_key: str
     attrs: list[A_SCH]
 
-    def get_attr(self, name: str) -> A_SCH | None:
-        for attr in self.attrs:
-            if attr.name == name:
-                return attr
-
     def get_columns(self) -> list[COL_SCH]:
-        return list(filter(lambda a: a.attr == Attrs.COLUMN, self.attrs))
+        return self.get_attrs(Attrs.COLUMN)
 
     def get_relations(self) -> list[REL_SCH]:
-        return list(filter(lambda a: a.attr == Attrs.RELATION, self.attrs))
+        return self.get_attrs(Attrs.RELATION)
 
     def get_composites(self) -> list[COMP_SCH]:
-        return list(filter(lambda a: a.attr == Attrs.COMPOSITE, self.attrs))
+        return self.get_attrs(Attrs.COMPOSITE)
 
     def get_properties(self) -> list[PROP_SCH]:
-        return list(filter(lambda a: a.attr == Attrs.PROPERTY, self.attrs))
+        return self.get_attrs(Attrs.PROPERTY)
 
     @property
     def full_name(self) -> str:
@@ -42,7 +35,7 @@ class ModelSchema(BaseModel):
 
 class ObjectSchema(ModelSchema):
     def get_lists(self) -> list[LIST_SCH]:
-        return list(filter(lambda a: a.attr == Attrs.LIST, self.attrs))
+        return self.get_attrs(Attrs.LIST)
 
 
 class DirectorySchema(ObjectSchema):
@@ -0,0 +1,71 @@
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from .app import AppSchema, get_default_app_schema
+
+
+__all__ = ["SerializedAppSchema", "get_serialized_app_schema"]
+
+
+class SerializedAppSchema:
+    """
+    App schema serialized once into JSON bytes with compressed variants.
+    Every variant has its own strong ETag, since its bytes differ.
+    """
+
+    def __init__(self, app_schema: AppSchema):
+        self.app_schema = app_schema
+        body = app_schema.model_dump_json().encode()
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants: dict[str, tuple[bytes, str]] = {'identity': (body, f'"{digest}"')}
+        self.variants['gzip'] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gzip"')
+        if brotli is not None:
+            self.variants['br'] = (brotli.compress(body), f'"{digest}-br"')
+
+    def choose_encoding(self, accept_encoding: str | None) -> str:
+        """The smallest acceptable variant: br, then gzip, then identity"""
+        if not accept_encoding:
+            return 'identity'
+        accepted = set()
+        for part in accept_encoding.split(','):
+            coding, _, params = part.strip().partition(';')
+            q = params.strip().removeprefix('q=')
+            try:
+                if params and float(q) <= 0:
+                    continue
+            except ValueError:
+                continue
+            accepted.add(coding.strip().lower())
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and (encoding in accepted or '*' in accepted):
+                return encoding
+        return 'identity'
+
+    def get(self, encoding: str) -> tuple[bytes, str]:
+        return self.variants[encoding]
+
+    @staticmethod
+    def etag_matches(etag: str, if_none_match: str | None) -> bool:
+        """Weak comparison, as If-None-Match requires"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        return etag in (tag.strip().removeprefix('W/') for tag in if_none_match.split(','))
+
+
+_serialized: SerializedAppSchema | None = None
+
+
+def get_serialized_app_schema() -> SerializedAppSchema:
+    """Serialized again only when default app schema is replaced"""
+    global _serialized
+    app_schema = get_default_app_schema()
+    if _serialized is None or _serialized.app_schema is not app_schema:
+        _serialized = SerializedAppSchema(app_schema)
+    return _serialized
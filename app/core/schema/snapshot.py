@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Iterator, Type
+
+from core.settings import settings
+from ._types import Attrs, Types, Relations, Composites
+from .app import AppSchema, AppInfo
+from .enums import EnumSchema
+from .models import DirectorySchema, DocumentSchema, ModelSchema
+from .attrs import (
+    AttrSchema, ColumnSchema, PropertySchema, ListSchema,
+    ForeignKeyRelationSchema, OneToOneRelationSchema,
+    ReverseForeignKeyRelationSchema, ReverseOneToOneRelationSchema,
+    OneOfCompositeSchema,
+)
+from .attrs import _constraints as constr
+
+
+__all__ = [
+    "SNAPSHOT_FORMAT", "get_schema_key", "get_snapshot_path",
+    "dump_app_schema", "load_app_schema", "save_snapshot", "load_snapshot",
+]
+
+
+# increased, when layout of snapshot or schema classes changes
+SNAPSHOT_FORMAT = 1
+
+# modules, which define, how models are turned into schema
+_GENERATOR_MODULES = ['core.db', 'core.schema', 'core.schema_generators', 'core.schema_collectors']
+# settings, which values become part of schema (default formats of constraints)
+_SCHEMA_SETTINGS = ['default_date_fmt', 'default_datetime_fmt', 'default_time_fmt']
+# relative snapshot path is resolved against it, not against working directory
+_APP_DIR = Path(__file__).resolve().parents[2]
+
+_CONSTRAINTS: dict[Types, Type[constr.Constraint]] = {
+    Types.BOOLEAN: constr.BooleanConstraint,
+    Types.DATE: constr.DateConstraint,
+    Types.DATETIME: constr.DateTimeConstraint,
+    Types.ENUM: constr.EnumConstraint,
+    Types.GUID: constr.GuidConstraint,
+    Types.INTEGER: constr.IntegerConstraint,
+    Types.NUMERIC: constr.NumericConstraint,
+    Types.STRING: constr.StringConstraint,
+    Types.TEXT: constr.StringConstraint,
+    Types.TIME: constr.TimeConstraint,
+}
+
+_RELATIONS: dict[Relations, Type[AttrSchema]] = {
+    Relations.FK: ForeignKeyRelationSchema,
+    Relations.O2O: OneToOneRelationSchema,
+    Relations.REV_FK: ReverseForeignKeyRelationSchema,
+    Relations.REV_O2O: ReverseOneToOneRelationSchema,
+}
+
+_COMPOSITES: dict[Composites, Type[AttrSchema]] = {
+    Composites.ONE_OF: OneOfCompositeSchema,
+}
+
+
+def _iter_source_files(module: str) -> Iterator[Path]:
+    spec = find_spec(module)
+    if spec is None:
+        raise ImportError(f'Module "{module}" not found')
+    if spec.submodule_search_locations:
+        for location in spec.submodule_search_locations:
+            yield from sorted(Path(location).rglob('*.py'))
+    elif spec.origin is not None:
+        yield Path(spec.origin)
+
+
+def get_schema_key() -> str:
+    """Hash of sources of entities, enums, collectors and schema generation code and of schema settings"""
+    modules = [
+        *settings.entities,
+        'enums',
+        *(collector.rpartition('.')[0] for collector in settings.schema_collectors),
+        *_GENERATOR_MODULES,
+    ]
+    digest = hashlib.sha256(f'{SNAPSHOT_FORMAT}:{settings.app.VERSION}'.encode())
+    digest.update(json.dumps({name: getattr(settings, name) for name in _SCHEMA_SETTINGS}).encode())
+    seen = set()
+    for module in modules:
+        for path in _iter_source_files(module):
+            if path in seen:
+                continue
+            seen.add(path)
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def get_snapshot_path() -> Path | None:
+    path = settings.app_schema_snapshot_path
+    if path is None:
+        return None
+    return _APP_DIR / path
+
+
+def dump_app_schema(app_schema: AppSchema) -> dict[str, Any]:
+    return app_schema.model_dump(mode='json')
+
+
+def _load_constraint(type_: str | None, data: dict[str, Any] | None) -> constr.Constraint | None:
+    if data is None:
+        return None
+    return _CONSTRAINTS[Types(type_)].model_validate(data)
+
+
+def _load_attr(data: dict[str, Any]) -> AttrSchema:
+    """Attr schemas are generic or polymorphic, so class is chosen by computed attr and type fields"""
+    match Attrs(data['attr']):
+        case Attrs.COLUMN:
+            return ColumnSchema[_CONSTRAINTS[Types(data['type'])]].model_validate(data)
+        case Attrs.RELATION:
+            return _RELATIONS[Relations(data['type'])].model_validate(data)
+        case Attrs.COMPOSITE:
+            return _COMPOSITES[Composites(data['type'])].model_validate(data)
+        case Attrs.PROPERTY:
+            return PropertySchema.model_validate({
+                **data,
+                'getter_constraints': _load_constraint(data['getter_type'], data['getter_constraints']),
+                'setter_constraints': _load_constraint(data['setter_type'], data['setter_constraints']),
+            })
+        case Attrs.LIST:
+            return ListSchema.model_validate({**data, 'attrs': [_load_attr(attr) for attr in data['attrs']]})
+
+
+def _load_model(schema_cls: Type[ModelSchema], data: dict[str, Any]) -> ModelSchema:
+    return schema_cls.model_validate({**data, 'attrs': [_load_attr(attr) for attr in data['attrs']]})
+
+
+def load_app_schema(data: dict[str, Any]) -> AppSchema:
+    return AppSchema(
+        info=AppInfo.model_validate(data['info']),
+        enums=[EnumSchema.model_validate(e) for e in data['enums']],
+        directories=[_load_model(DirectorySchema, d) for d in data['directories']],
+        documents=[_load_model(DocumentSchema, d) for d in data['documents']],
+    )
+
+
+def save_snapshot(path: str | Path, app_schema: AppSchema, key: str) -> None:
+    """Written to temporary file and renamed, so concurrently starting workers never read partial file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_text(json.dumps({'format': SNAPSHOT_FORMAT, 'key': key, 'schema': dump_app_schema(app_schema)}))
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str | Path, key: str) -> AppSchema | None:
+    """None, if snapshot is missing, broken or was made from other model definitions"""
+    try:
+        data = json.loads(Path(path).read_text())
+        if data.get('format') != SNAPSHOT_FORMAT or data.get('key') != key:
+            return None
+        return load_app_schema(data['schema'])
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
@@ -1,7 +1,7 @@
 from abc import ABC
 from enum import IntEnum, StrEnum
 
-from core.schema import EnumSchema, ENUM_SCH
+from core.schema.enums import EnumSchema, ENUM_SCH
 from ._base import BaseSchemaCollector
 
 
@@ -26,5 +26,25 @@ class BaseSettings(PydanticBaseSettings):
     default_datetime_fmt: ClassVar[str] = '{HH}:{MM}:{SS} {dd}.{mm}.{YYYY}'
     default_time_fmt: ClassVar[str] = '{HH}:{MM}:{SS}'
 
+    filter_plans_cache_size: ClassVar[int] = 512
+    check_sort_indexes: ClassVar[bool] = True
+    include_plans_cache_size: ClassVar[int] = 256
+    unique_check_chunk_size: ClassVar[int] = 1000
+    bulk_write_chunk_size: ClassVar[int] = 500
+    copy_chunk_size: ClassVar[int] = 10000
+    object_cache_size: ClassVar[int] = 10000
+    object_cache_ttl: ClassVar[float] = 300
+    password_hash_workers: ClassVar[int] = 4
+    password_hash_max_queue: ClassVar[int | None] = 1000
+    # False switches validators to interpretive path, e.g. for debugging
+    compile_validators: ClassVar[bool] = True
+    # shorter columns are checked without numpy, array overhead is bigger than gain
+    vectorize_validation_min_rows: ClassVar[int] = 64
+    stream_validation_chunk_size: ClassVar[int] = 1000
+    stream_validation_max_errors: ClassVar[int] = 1000
+    batch_validation_lookups: ClassVar[bool] = True
+    # None disables snapshot, relative path is resolved against app directory
+    app_schema_snapshot_path: ClassVar[str | None] = '.app_schema_snapshot.json'
+
 
 settings = cast(BaseSettings, LazyImport('settings.settings'))
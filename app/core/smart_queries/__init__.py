@@ -0,0 +1,5 @@
+from ._base import *
+from .include import *
+from .pagination import *
+from .sorting import *
+from .sqlalchemy import *
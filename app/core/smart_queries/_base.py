@@ -1,6 +1,11 @@
 from typing import Any
 
 from core.schema import O_SCH
+from .pagination import KeysetPage
+from .sorting import SortKey, parse_sort
+
+
+__all__ = ["SmartQuery"]
 
 
 class SmartQuery[T]:
@@ -11,12 +16,37 @@ class SmartQuery[T]:
             filters: dict[str, Any] = None,
             sort: list[str] = None,
             include: dict[str, Any] = None,
+            limit: int = None,
     ):
         raise NotImplementedError
 
+    def get_page(
+            self,
+            filters: dict[str, Any] = None,
+            sort: list[str] = None,
+            include: dict[str, Any] = None,
+            *,
+            limit: int,
+            cursor: str = None,
+    ) -> KeysetPage[T]:
+        raise NotImplementedError
+
     @classmethod
     def get_pk_attr(cls) -> str:
         return cls.schema.primary_key
 
     def get_many(self, pks: list):
         return self.get(filters={self.get_pk_attr(): ('in', pks)})
+
+    @classmethod
+    def parse_sort(cls, sort: list[str] | None) -> list[SortKey]:
+        return parse_sort(sort)
+
+    @classmethod
+    def keyset(cls, sort: list[str] | None) -> list[SortKey]:
+        """Sort keys with primary key as the last tie-breaker, so every row has unique position"""
+        keys = cls.parse_sort(sort)
+        pk = cls.get_pk_attr()
+        if all(key.field != pk for key in keys):
+            keys.append(SortKey(pk, keys[-1].descending if keys else False))
+        return keys
@@ -0,0 +1,117 @@
+from typing import Any, Type
+
+from sqlalchemy.orm import joinedload, selectinload, load_only
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+from core.db.models import Model, MODEL
+from core.schema import O_SCH, LIST_SCH, REL_SCH, AppSchema, Relations
+from core.settings import settings
+from core.utils import LRUCache
+
+
+__all__ = ["IncludeSpec", "normalize_include", "IncludeCompiler"]
+
+
+IncludeSpec = tuple[tuple[str, Any], ...]
+
+
+def normalize_include(include: dict[str, Any] | list[str]) -> IncludeSpec:
+    """
+    {"user": True, "items": {"qty": True, "product": ["name"]}}
+      -> (("items", (("product", (("name", None),)), ("qty", None))), ("user", None))
+    List of names is shortcut for {name: True for name in list}, False values are skipped.
+    Result is hashable and does not depend on keys order, so it can be used as cache key.
+    """
+    if isinstance(include, dict):
+        items = include.items()
+    elif isinstance(include, (list, tuple, set, frozenset)):
+        items = ((name, True) for name in include)
+    else:
+        raise ValueError(f'Incorrect include "{include}"')
+    spec = {}
+    for name, value in items:
+        if value is False:
+            continue
+        spec[name] = None if value is True or value is None else normalize_include(value)
+    return tuple(sorted(spec.items()))
+
+
+class IncludeCompiler:
+    """
+    Compiles include spec to loader options with the least round trips:
+    - forward relations (fk, o2o) and reverse o2o are loaded by joinedload, in the same query;
+    - reverse fk and lists are loaded by selectinload, one query per relation, no matter how many rows;
+    - columns named in a level are projected by load_only (keys needed for loading are always added).
+    Level without columns loads all columns of its entity.
+    """
+    _plans: LRUCache[tuple[str, IncludeSpec], tuple[ORMOption, ...]] = LRUCache(
+        maxsize=settings.include_plans_cache_size
+    )
+
+    def __init__(self, schema: O_SCH, app_schema: AppSchema, model: Type[MODEL] = None):
+        self.schema = schema
+        self.app_schema = app_schema
+        self.model = model if model is not None else Model.find_by_name(schema.full_name, raise_if_none=True)
+
+    def compile(self, include: dict[str, Any] | list[str]) -> tuple[ORMOption, ...]:
+        spec = normalize_include(include)
+        key = (self.schema.full_name, spec)
+        options = self._plans.get(key)
+        if options is None:
+            options = tuple(self.make_options(self.schema, self.model, spec, keys={self.schema.primary_key}))
+            self._plans.set(key, options)
+        return options
+
+    def make_options(
+            self,
+            schema: O_SCH | LIST_SCH,
+            entity: Type[MODEL],
+            spec: IncludeSpec,
+            keys: set[str],
+    ) -> list[ORMOption]:
+        options: list[ORMOption] = []
+        columns, required, projection = set(), set(keys), True
+        for name, sub_spec in spec:
+            attr = schema.get_attr(name)
+            if attr is None:
+                raise ValueError(f'"{name}" is not attr of "{schema.name}"')
+            if attr.attr.is_column:
+                if sub_spec is not None:
+                    raise ValueError(f'Column "{name}" of "{schema.name}" can`t include attrs')
+                columns.add(name)
+            elif attr.attr.is_relation:
+                options.append(self.relation_loader(schema, entity, attr, sub_spec))
+                if attr.type.is_forward:
+                    required.add(attr.local_key)
+            elif attr.attr.is_list:
+                options.append(self.list_loader(entity, attr, sub_spec))
+            else:
+                # composites and properties are built from columns, projection would break them
+                projection = False
+        if columns and projection:
+            options.append(load_only(*(getattr(entity, col) for col in sorted(columns | required))))
+        return options
+
+    def relation_loader(self, schema: O_SCH | LIST_SCH, entity: Type[MODEL], rel: REL_SCH, spec: IncludeSpec | None):
+        target = Model.find_by_name(rel.to_model, raise_if_none=True)
+        target_schema = self.app_schema.get_reference(rel.to_model)
+        if rel.type.is_forward:
+            # row always has a pair for not nullable key, so INNER JOIN is enough
+            loader = joinedload(getattr(entity, rel.name), innerjoin=not schema.get_attr(rel.local_key).nullable)
+        elif rel.type is Relations.REV_O2O:
+            loader = joinedload(getattr(entity, rel.name))
+        else:
+            loader = selectinload(getattr(entity, rel.name))
+        keys = {target_schema.primary_key, rel.remote_key}
+        return self.with_options(loader, self.make_options(target_schema, target, spec or (), keys=keys))
+
+    def list_loader(self, entity: Type[MODEL], list_schema: LIST_SCH, spec: IncludeSpec | None):
+        list_model = entity.get_list_model(list_schema.name)
+        keys = {col.key for col in list_model.__mapper__.primary_key}
+        loader = selectinload(getattr(entity, list_schema.name))
+        return self.with_options(loader, self.make_options(list_schema, list_model, spec or (), keys=keys))
+
+    @staticmethod
+    def with_options(loader: _AbstractLoad, options: list[ORMOption]) -> _AbstractLoad:
+        return loader.options(*options) if options else loader
@@ -0,0 +1,55 @@
+import enum
+import json
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from binascii import Error as BinasciiError
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import UUID
+
+
+__all__ = ["KeysetPage", "InvalidCursor", "encode_cursor", "decode_cursor"]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPage[T]:
+    def __init__(self, items: list[T], next_cursor: str | None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(sort: list[str], values: list[Any]) -> str:
+    """Opaque cursor with sort keys of the page and values of the last row"""
+    raw = json.dumps([sort, [_dump_value(v) for v in values]], separators=(',', ':'))
+    return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort: list[str], transformers: list[Callable[[Any], Any]]) -> list[Any]:
+    """Values of the last row of previous page, transformed back to python types"""
+    try:
+        cursor_sort, values = json.loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (BinasciiError, UnicodeDecodeError, ValueError, TypeError):
+        raise InvalidCursor('Cursor is malformed')
+    if cursor_sort != sort or not isinstance(values, list) or len(values) != len(transformers):
+        raise InvalidCursor('Cursor does not match sort')
+    try:
+        return [transform(value) for transform, value in zip(transformers, values)]
+    except (ValueError, TypeError):
+        raise InvalidCursor('Cursor contains incorrect values')
@@ -0,0 +1,127 @@
+import warnings
+from typing import Callable, NamedTuple
+
+from sqlalchemy import Column, Table, UniqueConstraint, PrimaryKeyConstraint, UnaryExpression
+from sqlalchemy.sql import operators
+
+
+__all__ = [
+    "SortKey", "parse_sort", "UnindexedSort", "UnindexedSortWarning",
+    "on_unindexed_sort", "is_sort_indexed", "check_sort_index",
+]
+
+
+class SortKey(NamedTuple):
+    field: str
+    descending: bool
+
+
+def parse_sort(sort: list[str] | None) -> list[SortKey]:
+    """["-dt", "user.name"] -> [SortKey("dt", True), SortKey("user.name", False)]"""
+    parsed = []
+    for key in sort or ():
+        descending = key.startswith('-')
+        field = key[1:] if descending else key
+        if not field or '' in field.split('.'):
+            raise ValueError(f'Incorrect sort key "{key}"')
+        parsed.append(SortKey(field, descending))
+    return parsed
+
+
+class UnindexedSort(NamedTuple):
+    owner: str
+    sort: list[SortKey]
+    table: str
+
+
+class UnindexedSortWarning(UserWarning):
+    pass
+
+
+UnindexedSortHook = Callable[[UnindexedSort], None]
+
+_unindexed_sort_hooks: list[UnindexedSortHook] = []
+
+
+def on_unindexed_sort(func: UnindexedSortHook) -> UnindexedSortHook:
+    """Register hook, that is called every time sort without supporting index is requested"""
+    _unindexed_sort_hooks.append(func)
+    return func
+
+
+@on_unindexed_sort
+def warn_unindexed_sort(event: UnindexedSort) -> None:
+    sort = ', '.join(('-' if key.descending else '') + key.field for key in event.sort)
+    warnings.warn(
+        f'Sort [{sort}] of "{event.owner}" has no supporting index in "{event.table}"',
+        UnindexedSortWarning,
+        stacklevel=4,
+    )
+
+
+IndexOrder = tuple[tuple[tuple[Column, bool], ...], bool]
+
+_table_orders: dict[Table, list[IndexOrder]] = {}
+
+
+def get_index_orders(table: Table) -> list[IndexOrder]:
+    """Column orders ((column, descending), ...), unique) provided by primary key, unique constraints and indexes"""
+    orders = _table_orders.get(table)
+    if orders is not None:
+        return orders
+    orders = []
+    for constraint in table.constraints:
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint)) and len(constraint.columns):
+            orders.append((tuple((col, False) for col in constraint.columns), True))
+    for index in table.indexes:
+        order = []
+        for expr in index.expressions:
+            descending = False
+            if isinstance(expr, UnaryExpression):
+                descending = expr.modifier is operators.desc_op
+                expr = expr.element
+            if not isinstance(expr, Column):
+                # functional index, ORDER BY column can`t use it and everything after it
+                break
+            order.append((expr, descending))
+        if order:
+            orders.append((tuple(order), index.unique and len(order) == len(index.expressions)))
+    _table_orders[table] = orders
+    return orders
+
+
+def is_sort_indexed(keys: list[tuple[Column, bool]]) -> bool:
+    """
+    Sort can be read from btree index (forward or backward) of the table of the first key.
+    Keys are the index prefix, or unique index is the keys prefix (keys after it are never compared).
+    """
+    if not keys:
+        return True
+    table = keys[0][0].table
+    run = []
+    for col, descending in keys:
+        if col.table is not table:
+            break
+        run.append((col, descending))
+    complete = len(run) == len(keys)
+
+    for order, unique in get_index_orders(table):
+        size = min(len(run), len(order))
+        if any(a[0] is not b[0] for a, b in zip(run[:size], order[:size])):
+            continue
+        if len({a[1] != b[1] for a, b in zip(run[:size], order[:size])}) != 1:
+            continue
+        if size == len(run) and complete or size == len(order) and unique:
+            return True
+    return False
+
+
+def check_sort_index(owner: str, sort: list[SortKey], columns: list[Column]) -> bool:
+    """Call unindexed sort hooks, if sort is not supported by index"""
+    keys = [(col, key.descending) for col, key in zip(columns, sort)]
+    if is_sort_indexed(keys):
+        return True
+    event = UnindexedSort(owner=owner, sort=sort, table=keys[0][0].table.fullname)
+    for hook in _unindexed_sort_hooks:
+        hook(event)
+    return False
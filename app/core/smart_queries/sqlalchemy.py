@@ -0,0 +1,132 @@
+from typing import Any, Type, cast
+
+from sqlalchemy import Select, ColumnElement, select, tuple_, and_, or_, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from core.db.models import MODEL
+from core.filters.processors.joins import JoinPlan
+from core.filters.processors.sqlalchemy import SaFilterProcessor
+from core.schema import O_SCH, COL_SCH, AppSchema, get_default_app_schema
+from core.settings import settings
+from core.validators.attrs import get_constraints_validator
+from ._base import SmartQuery
+from .include import IncludeCompiler
+from .pagination import KeysetPage, encode_cursor, decode_cursor
+from .sorting import SortKey, check_sort_index
+
+
+__all__ = ["SaSmartQuery"]
+
+
+class SaSmartQuery[T: MODEL](SmartQuery[T]):
+    model: Type[T]
+    schema: O_SCH
+
+    def __init__(self, session: AsyncSession, app_schema: AppSchema = None):
+        self.session = session
+        self.app_schema = app_schema if app_schema is not None else get_default_app_schema()
+
+    @classmethod
+    def bind(cls, model: Type[T], schema: O_SCH) -> Type["SaSmartQuery[T]"]:
+        return cast(Type[SaSmartQuery[T]], type(f'{model.__name__}SmartQuery', (cls,), {
+            'model': model, 'schema': schema,
+        }))
+
+    def filter_processor(self) -> SaFilterProcessor:
+        return SaFilterProcessor(schema=self.schema, app_schema=self.app_schema, model=self.model)
+
+    def include_compiler(self) -> IncludeCompiler:
+        return IncludeCompiler(schema=self.schema, app_schema=self.app_schema, model=self.model)
+
+    def build_query(
+            self,
+            filters: dict[str, Any] = None,
+            include: dict[str, Any] = None,
+    ) -> tuple[Select[tuple[T]], JoinPlan, dict[str, Any]]:
+        """Query with cached filter clauses, their joins and values for parameters, which are bound on execution"""
+        plan, params = self.filter_processor().compile_filters(filters or {})
+        query = select(self.model).where(*plan.clauses)
+        if include:
+            query = query.options(*self.include_compiler().compile(include))
+        return query, plan.joins.copy(), params
+
+    def sort_column(self, field: str, joins: JoinPlan) -> InstrumentedAttribute:
+        """Related fields are joined by the same plan as filters, so filter and sort by "user.name" share one join"""
+        if joins.is_reverse(field):
+            raise ValueError(f'Can`t sort by "{field}": it is behind reverse relation')
+        return joins.column(field)
+
+    def order_by(self, keys: list[SortKey], joins: JoinPlan) -> list[ColumnElement]:
+        columns = [self.sort_column(key.field, joins) for key in keys]
+        if keys and settings.check_sort_indexes:
+            check_sort_index(self.schema.full_name, keys, [col.property.columns[0] for col in columns])
+        return [col.desc() if key.descending else col.asc() for col, key in zip(columns, keys)]
+
+    async def get(
+            self,
+            filters: dict[str, Any] = None,
+            sort: list[str] = None,
+            include: dict[str, Any] = None,
+            limit: int = None,
+    ) -> list[T]:
+        query, joins, params = self.build_query(filters=filters, include=include)
+        query = query.order_by(*self.order_by(self.parse_sort(sort), joins))
+        if limit is not None:
+            query = query.limit(limit)
+        return list(await self.session.scalars(joins.apply(query), params))
+
+    async def get_page(
+            self,
+            filters: dict[str, Any] = None,
+            sort: list[str] = None,
+            include: dict[str, Any] = None,
+            *,
+            limit: int,
+            cursor: str = None,
+    ) -> KeysetPage[T]:
+        assert limit > 0
+        sort = list(sort or ())
+        keys = self.keyset(sort)
+        query, joins, params = self.build_query(filters=filters, include=include)
+        order_by = self.order_by(keys, joins)
+        columns = [self.sort_column(key.field, joins) for key in keys]
+        transformers = [self.cursor_transformer(key.field, joins) for key in keys]
+
+        if cursor is not None:
+            values = decode_cursor(cursor, sort=sort, transformers=transformers)
+            query = query.where(keyset_condition(columns, [key.descending for key in keys], values))
+
+        query = query.add_columns(*columns).order_by(*order_by).limit(limit + 1)
+        rows = (await self.session.execute(joins.apply(query), params)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(sort, list(rows[-1][1:]))
+        return KeysetPage(items=[row[0] for row in rows], next_cursor=next_cursor)
+
+    @staticmethod
+    def cursor_transformer(field: str, joins: JoinPlan):
+        if joins.is_nullable(field):
+            raise ValueError(f'Nullable "{field}" can`t be used for keyset pagination')
+        col_schema: COL_SCH = joins.attr(field)
+        return get_constraints_validator(col_schema.constraints).transform
+
+
+def keyset_condition(columns: list[ColumnElement], descending: list[bool], values: list[Any]) -> ColumnElement[bool]:
+    """
+    Rows after the (values) position.
+    Same direction for all keys gives row-value comparison (a, b) > (:a, :b), which uses composite index as is.
+    Mixed directions are expanded into (a > :a) OR (a = :a AND b < :b) ...
+    """
+    params = [literal(value, col.type) for col, value in zip(columns, values)]
+    if all(descending) or not any(descending):
+        if descending[0]:
+            return tuple_(*columns) < tuple_(*params)
+        return tuple_(*columns) > tuple_(*params)
+    conditions = []
+    for idx, (col, desc, param) in enumerate(zip(columns, descending, params)):
+        equals = [c == p for c, p in zip(columns[:idx], params[:idx])]
+        conditions.append(and_(*equals, col < param if desc else col > param))
+    return or_(*conditions)
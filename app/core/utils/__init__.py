@@ -2,3 +2,5 @@ from .decorators import *
 from .imports import *
 from .funcs import *
 from .string import *
+from .cache import *
+from .pools import *
@@ -0,0 +1,68 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Hashable, Any
+
+from core.constants import EMPTY
+
+
+__all__ = ["LRUCache", "TTLCache"]
+
+
+class LRUCache[K: Hashable, V]:
+    """Dict-like cache with bounded size. Least recently used key is evicted first."""
+
+    def __init__(self, maxsize: int = 128):
+        assert maxsize > 0
+        self.maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        value = self._data.get(key, EMPTY)
+        if value is EMPTY:
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K, default: Any = None) -> V | Any:
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache[K: Hashable, V](LRUCache[K, tuple[float, V]]):
+    """LRUCache, which values expire in ttl seconds after they were set"""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60):
+        super().__init__(maxsize=maxsize)
+        assert ttl > 0
+        self.ttl = ttl
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        item = super().get(key, EMPTY)
+        if item is EMPTY:
+            return default
+        expires_at, value = item
+        if expires_at <= monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        super().set(key, (monotonic() + self.ttl, value))
+
+    def pop(self, key: K, default: Any = None) -> V | Any:
+        item = super().pop(key, EMPTY)
+        return default if item is EMPTY else item[1]
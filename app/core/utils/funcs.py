@@ -1,8 +1,9 @@
-from typing import Any, Callable, overload, Literal, TypeVar
+from itertools import islice
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, overload, Literal, TypeVar
 from core.constants import EMPTY
 
 
-__all__ = ["clean_kwargs", "default_if_none", "default_if_empty"]
+__all__ = ["clean_kwargs", "default_if_none", "default_if_empty", "chunked", "achunked"]
 
 T = TypeVar('T')
 
@@ -42,4 +43,25 @@ def default_if_empty(obj, default: T | Callable[[], T], is_factory: bool = False
     return obj
 
 
-
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    assert size > 0
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def achunked(items: Iterable[T] | AsyncIterable[T], size: int) -> AsyncIterator[list[T]]:
+    """chunked for both sync and async iterables"""
+    if not isinstance(items, AsyncIterable):
+        for chunk in chunked(items, size):
+            yield chunk
+        return
+    assert size > 0
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,111 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from time import monotonic
+from typing import Callable, Any
+
+
+__all__ = ["BoundedPool", "PoolOverloaded", "get_pool", "get_pools_stats"]
+
+
+class PoolOverloaded(RuntimeError):
+    pass
+
+
+class PoolStats:
+    __slots__ = ('queued', 'running', 'completed', 'rejected', 'max_queued', 'wait_time', '_lock')
+
+    def __init__(self):
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_queued = 0
+        self.wait_time = 0.0
+        self._lock = Lock()
+
+    def submitted(self) -> None:
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+    def started(self, waited: float) -> None:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_time += waited
+
+    def finished(self) -> None:
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+
+    def export(self) -> dict[str, int | float]:
+        return {
+            'queued': self.queued,
+            'running': self.running,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'max_queued': self.max_queued,
+            'avg_wait': self.wait_time / self.completed if self.completed else 0.0,
+        }
+
+
+class BoundedPool:
+    """
+    Dedicated threads for blocking CPU bound calls (e.g. password hashing), so they don't stall event loop
+    and don't occupy default executor. At most max_workers calls run at once, others wait in queue.
+    When max_queue calls are waiting, new calls are rejected with PoolOverloaded.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int | None = None):
+        assert max_workers > 0
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.stats = PoolStats()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        return self._executor
+
+    async def run[T](self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if self.max_queue is not None and self.stats.queued >= self.max_queue:
+            self.stats.rejected += 1
+            raise PoolOverloaded(f'Pool "{self.name}" has {self.stats.queued} calls in queue')
+        self.stats.submitted()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, partial(self._call, monotonic(), func, args, kwargs)
+        )
+
+    def _call(self, submitted_at: float, func: Callable, args: tuple, kwargs: dict[str, Any]) -> Any:
+        self.stats.started(monotonic() - submitted_at)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.stats.finished()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pools: dict[str, BoundedPool] = {}
+
+
+def get_pool(name: str, max_workers: int, max_queue: int | None = None) -> BoundedPool:
+    """Pool is created once per name, later arguments are ignored"""
+    pool = _pools.get(name)
+    if pool is None:
+        pool = _pools[name] = BoundedPool(name=name, max_workers=max_workers, max_queue=max_queue)
+    return pool
+
+
+def get_pools_stats() -> dict[str, dict[str, int | float]]:
+    """Queue depth and counters of all pools for monitoring"""
+    return {name: pool.stats.export() for name, pool in _pools.items()}
@@ -1,5 +1,5 @@
 from inspect import getfullargspec, iscoroutinefunction
-from typing import Generic, TypeVar, Any, TYPE_CHECKING, Type, Union, Callable
+from typing import Generic, TypeVar, Any, TYPE_CHECKING, Type, Union, Callable, Awaitable, Iterable, NamedTuple
 
 from core.constants import EMPTY
 from core.schema import A_SCH
@@ -9,20 +9,40 @@ if TYPE_CHECKING:
     from core.repositories import O_REP, LIST_REP
     from ..objects import O_VAL
     from ..lists import LIST_VAL
+    from ..compiler import CompiledFunc
 
 
-__all__ = ["AttrValidator", "A_VAL", "AttrValidatorParent", "ParentRepository"]
+__all__ = ["AttrValidator", "A_VAL", "AttrValidatorParent", "ParentRepository", "UniqueScope"]
 
 T = TypeVar('T', bound=Any)
 AttrValidatorParent = Type["O_VAL"] | Type["LIST_VAL"]
 ParentRepository = Union["M_REP", "LIST_REP"]
 
 
+class UniqueScope(NamedTuple):
+    """
+    Scope of unique checks of bulk write. pks are keys of updated rows (by index of value),
+    so value may equal the stored value of its own row. Attrs in skip_db are checked only inside the batch.
+    """
+    pks: list[Any] | None = None
+    skip_db: frozenset[str] = frozenset()
+
+    def subset(self, ids: Iterable[int]) -> "UniqueScope":
+        return self if self.pks is None else self._replace(pks=[self.pks[i] for i in ids])
+
+
 class AttrValidator(Generic[A_SCH, T]):
+    # value validation can be generated by compiler (see get_compiled)
+    _compilable: bool = False
+
     def __init__(self, schema: A_SCH, parent: AttrValidatorParent):
         self.schema = schema
         self.parent = parent
         self._validators: list[ValidatorFuncWrapper] = []
+        # validators split by kind once, so sync ones run without creating coroutines
+        self._sync_checks: list[Callable[[Any, ParentRepository], Any]] = []
+        self._async_checks: list[Callable[[Any, ParentRepository], Awaitable[Any]]] = []
+        self._compiled: "CompiledFunc | None" = EMPTY
         self._post_init()
 
     def _post_init(self):
@@ -31,15 +51,32 @@ class AttrValidator(Generic[A_SCH, T]):
     async def validate(self, value: Any, repository: ParentRepository) -> T:
         raise NotImplementedError()
 
-    async def validate_list(self, list_of_values: list, repository: LIST_REP) -> list[T]:
+    @property
+    def can_validate_sync(self) -> bool:
+        return False
+
+    def validate_sync(self, value: Any, repository: ParentRepository) -> T:
+        """Validation without event loop, available when can_validate_sync"""
+        raise NotImplementedError()
+
+    async def validate_list(
+            self,
+            list_of_values: list,
+            repository: "LIST_REP",
+            unique_scope: UniqueScope = None,
+    ) -> list[T]:
         list_errors = ListErrors()
         valid_list = []
+        is_sync = self.can_validate_sync
         for idx, value in enumerate(list_of_values):
             if value is EMPTY:
                 valid_list.append(EMPTY)
             else:
                 try:
-                    valid_list.append(await self.validate(value=value, repository=repository))
+                    if is_sync:
+                        valid_list.append(self.validate_sync(value=value, repository=repository))
+                    else:
+                        valid_list.append(await self.validate(value=value, repository=repository))
                 except ValidationError as err:
                     list_errors.add(idx=idx, err=err)
         if list_errors:
@@ -49,12 +86,20 @@ class AttrValidator(Generic[A_SCH, T]):
     def modify_parent(self):
         pass
 
+    def get_compiled(self) -> "CompiledFunc | None":
+        """Generated function of value validation. None, if validator is not compilable or compiling is disabled"""
+        if self._compiled is EMPTY:
+            from ..compiler import compile_value_validator, is_compiling_enabled
+            self._compiled = compile_value_validator(self) if self._compilable and is_compiling_enabled() else None
+        return self._compiled
+
     def add_validator(self, func: Callable, index: int = -1):
         assert not self.has_validator(func)
         if index == -1:
             self._validators.append(ValidatorFuncWrapper(self, func))
         else:
             self._validators.insert(index, ValidatorFuncWrapper(self, func))
+        self._on_validators_changed()
 
     def has_validator(self, func: Callable) -> bool:
         return any(val == func for val in self._validators)
@@ -67,6 +112,24 @@ class AttrValidator(Generic[A_SCH, T]):
         if rm is None:
             raise ValueError(f'{self} has no validator {func}')
         self._validators.remove(rm)
+        self._on_validators_changed()
+
+    def _on_validators_changed(self):
+        self._compiled = EMPTY
+        self._sync_checks = [val.as_check() for val in self._validators if not val.coro]
+        self._async_checks = [val.as_check() for val in self._validators if val.coro]
+
+    @property
+    def has_async_checks(self) -> bool:
+        return bool(self._async_checks)
+
+    def run_sync_checks(self, value: Any, repository: ParentRepository) -> None:
+        for check in self._sync_checks:
+            check(value, repository)
+
+    async def run_async_checks(self, value: Any, repository: ParentRepository) -> None:
+        for check in self._async_checks:
+            await check(value, repository)
 
     @property
     def is_nullable(self) -> bool:
@@ -118,6 +181,19 @@ class ValidatorFuncWrapper(Generic[T]):
             return kwargs
         return {k: v for k, v in kwargs.items() if k in self.args}
 
+    def as_check(self) -> Callable[[Any, ParentRepository], Any]:
+        """Call with (value, repository), kwargs are filtered once here, not on every call"""
+        func = self.func
+        pass_value = self.as_is or 'value' in self.args
+        pass_repository = self.as_is or 'repository' in self.args
+        if pass_value and pass_repository:
+            return lambda value, repository: func(value=value, repository=repository)
+        if pass_value:
+            return lambda value, repository: func(value=value)
+        if pass_repository:
+            return lambda value, repository: func(repository=repository)
+        return lambda value, repository: func()
+
     async def __call__(self, **kwargs):
         kwargs = self.filter_kwargs(kwargs)
         if self.coro:
@@ -128,7 +204,7 @@ class ValidatorFuncWrapper(Generic[T]):
     @classmethod
     def get_available_args(cls, attr_validator: A_VAL):
         spec = getfullargspec(attr_validator.validate)
-        return [arg != 'self' for arg in spec.args + spec.kwonlyargs]
+        return [arg for arg in spec.args + spec.kwonlyargs if arg != 'self']
 
     def __eq__(self, other):
         return self.func is other
@@ -1,7 +1,9 @@
+import operator
 import re
-from typing import Generic, Callable, Iterator, TypeVar, Any, Type, Optional
+from typing import Generic, Callable, Iterator, TypeVar, Any, Type, Optional, NamedTuple
 from datetime import date, datetime, time
 from decimal import Decimal
+from uuid import UUID
 
 from core import type_transformers, types
 from core.schema import (
@@ -14,7 +16,7 @@ from .. import exceptions as err
 
 
 __all__ = [
-    "ConstraintValidator", "CONSTR_VAL", "get_constraints_validator",
+    "ConstraintValidator", "CONSTR_VAL", "get_constraints_validator", "VectorCheck",
     "BooleanConstraintValidator", "DateConstraintValidator", "DateTimeConstraintValidator",
     "EnumConstraintValidator", "GuidConstraintValidator", "IntegerConstraintValidator",
     "NumericConstraintValidator", "StringConstraintValidator", "TimeConstraintValidator",
@@ -24,6 +26,22 @@ __all__ = [
 T = TypeVar('T', bound=Any)
 
 
+class VectorCheck(NamedTuple):
+    """Check of whole column: value fails, if fails(key(value), bound)"""
+    key: Callable[[Any], Any] | None
+    fails: Callable[[Any, Any], Any]
+    bound: Any
+    error: err.ValidationError
+
+
+def _exponent(value: Decimal) -> int:
+    return value.as_tuple().exponent
+
+
+def _digits(value: Decimal) -> int:
+    return len(value.as_tuple().digits)
+
+
 class ConstraintValidator(Generic[CONSTRAINT, T]):
     _transform: Callable[[Any], T | None]
 
@@ -33,6 +51,10 @@ class ConstraintValidator(Generic[CONSTRAINT, T]):
     def get_validators(self) -> Iterator[Callable]:
         return iter([])
 
+    def get_vector_checks(self) -> dict[Callable, tuple[VectorCheck, ...]]:
+        """Validators, that can be evaluated over column of values at once, and their column form"""
+        return {}
+
     def transform(self, value: Any) -> T | None:
         return self._transform(value)
 
@@ -41,11 +63,11 @@ CONSTR_VAL = TypeVar('CONSTR_VAL', bound=ConstraintValidator)
 
 
 class BooleanConstraintValidator(ConstraintValidator[BooleanConstraint, bool]):
-    _transform = type_transformers.transform_bool
+    _transform = staticmethod(type_transformers.transform_bool)
 
 
 class DateConstraintValidator(ConstraintValidator[DateConstraint, date]):
-    _transform = type_transformers.transform_date
+    _transform = staticmethod(type_transformers.transform_date)
 
     def get_validators(self) -> Iterator[Callable]:
         if self.constr.gte is not None:
@@ -53,6 +75,18 @@ class DateConstraintValidator(ConstraintValidator[DateConstraint, date]):
         if self.constr.lte is not None:
             yield self._validate_lte
 
+    def get_vector_checks(self) -> dict[Callable, tuple[VectorCheck, ...]]:
+        checks = {}
+        if self.constr.gte is not None:
+            checks[self._validate_gte] = (VectorCheck(
+                date.toordinal, operator.lt, self.constr.gte.toordinal(), err.DateGteError(value=self.constr.gte)
+            ), )
+        if self.constr.lte is not None:
+            checks[self._validate_lte] = (VectorCheck(
+                date.toordinal, operator.gt, self.constr.lte.toordinal(), err.DateLteError(value=self.constr.lte)
+            ), )
+        return checks
+
     def _validate_gte(self, value: date):
         if value < self.constr.gte:
             raise err.DateGteError(value=self.constr.gte)
@@ -102,12 +136,12 @@ class EnumConstraintValidator(ConstraintValidator[EnumConstraint, types.ENUM]):
         return type_transformers.transform_enum(value, python_enum=self.constr.python_type)
 
 
-class GuidConstraintValidator(ConstraintValidator[GuidConstraint]):
-    _transform = type_transformers.transform_guid
+class GuidConstraintValidator(ConstraintValidator[GuidConstraint, UUID]):
+    _transform = staticmethod(type_transformers.transform_guid)
 
 
-class IntegerConstraintValidator(ConstraintValidator[IntegerConstraint]):
-    _transform = type_transformers.transform_integer
+class IntegerConstraintValidator(ConstraintValidator[IntegerConstraint, int]):
+    _transform = staticmethod(type_transformers.transform_integer)
 
     def get_validators(self) -> Iterator[Callable]:
         if self.constr.gte is not None:
@@ -115,6 +149,18 @@ class IntegerConstraintValidator(ConstraintValidator[IntegerConstraint]):
         if self.constr.lte is not None:
             yield self._validate_lte
 
+    def get_vector_checks(self) -> dict[Callable, tuple[VectorCheck, ...]]:
+        checks = {}
+        if self.constr.gte is not None:
+            checks[self._validate_gte] = (
+                VectorCheck(None, operator.lt, self.constr.gte, err.IntegerGteError(value=self.constr.gte)),
+            )
+        if self.constr.lte is not None:
+            checks[self._validate_lte] = (
+                VectorCheck(None, operator.gt, self.constr.lte, err.IntegerLteError(value=self.constr.lte)),
+            )
+        return checks
+
     def _validate_gte(self, value: int):
         if value < self.constr.gte:
             raise err.IntegerGteError(value=self.constr.gte)
@@ -124,8 +170,8 @@ class IntegerConstraintValidator(ConstraintValidator[IntegerConstraint]):
             raise err.IntegerLteError(value=self.constr.lte)
 
 
-class StringConstraintValidator(ConstraintValidator[StringConstraint]):
-    _transform = type_transformers.transform_string
+class StringConstraintValidator(ConstraintValidator[StringConstraint, str]):
+    _transform = staticmethod(type_transformers.transform_string)
 
     def __init__(self, constr: StringConstraint):
         super().__init__(constr=constr)
@@ -139,6 +185,18 @@ class StringConstraintValidator(ConstraintValidator[StringConstraint]):
         if self.constr.pattern is not None:
             yield self._validate_pattern
 
+    def get_vector_checks(self) -> dict[Callable, tuple[VectorCheck, ...]]:
+        checks = {}
+        if self.constr.min_length is not None:
+            checks[self._validate_min_length] = (VectorCheck(
+                len, operator.lt, self.constr.min_length, err.StringMinLengthError(self.constr.min_length)
+            ), )
+        if self.constr.max_length is not None:
+            checks[self._validate_max_length] = (VectorCheck(
+                len, operator.gt, self.constr.max_length, err.StringMaxLengthError(self.constr.max_length)
+            ), )
+        return checks
+
     def _validate_min_length(self, value: str):
         if len(value) < self.constr.min_length:
             raise err.StringMinLengthError(self.constr.min_length)
@@ -152,7 +210,7 @@ class StringConstraintValidator(ConstraintValidator[StringConstraint]):
             raise err.StringPatternError
 
 
-class NumericConstraintValidator(ConstraintValidator[NumericConstraint]):
+class NumericConstraintValidator(ConstraintValidator[NumericConstraint, Decimal]):
 
     def get_validators(self) -> Iterator[Callable]:
         yield self._validate_size
@@ -165,6 +223,28 @@ class NumericConstraintValidator(ConstraintValidator[NumericConstraint]):
         if self.constr.lt is not None:
             yield self._validate_lt
 
+    def get_vector_checks(self) -> dict[Callable, tuple[VectorCheck, ...]]:
+        constr = self.constr
+        checks = {
+            self._validate_size: (
+                VectorCheck(_exponent, operator.ne, -constr.scale, err.NumericBigScaleError(value=constr.scale)),
+                VectorCheck(
+                    _digits, operator.gt, constr.precision + constr.scale,
+                    err.NumericBigPrecisionError(value=constr.precision),
+                ),
+            ),
+        }
+        bounds = (
+            (self._validate_gte, operator.lt, constr.gte, err.NumericGteError),
+            (self._validate_lte, operator.gt, constr.lte, err.NumericLteError),
+            (self._validate_gt, operator.le, constr.gt, err.NumericGtError),
+            (self._validate_lt, operator.ge, constr.lt, err.NumericLtError),
+        )
+        for check, fails, bound, error in bounds:
+            if bound is not None:
+                checks[check] = (VectorCheck(None, fails, bound, error(value=bound)), )
+        return checks
+
     def _validate_size(self, value: Decimal):
         _, digits, exp = value.as_tuple()
         if self.constr.scale != -exp:
@@ -192,8 +272,8 @@ class NumericConstraintValidator(ConstraintValidator[NumericConstraint]):
         return type_transformers.transform_numeric(value, self.constr.precision, self.constr.scale)
 
 
-class TimeConstraintValidator(ConstraintValidator[TimeConstraint]):
-    _transform = type_transformers.transform_time
+class TimeConstraintValidator(ConstraintValidator[TimeConstraint, time]):
+    _transform = staticmethod(type_transformers.transform_time)
 
     def get_validators(self) -> Iterator[Callable]:
         if self.constr.gte is not None:
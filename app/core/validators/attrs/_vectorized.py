@@ -0,0 +1,54 @@
+from typing import Any, Callable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.settings import settings
+from ._constraints import VectorCheck
+from ..exceptions import ValidationError
+
+
+__all__ = ["evaluate_vector_checks"]
+
+
+def _to_array(values: list[Any]) -> "np.ndarray":
+    """Python ints, that don't fit int64, and other objects (Decimal, time...) are compared elementwise"""
+    if values and type(values[0]) is int:
+        try:
+            return np.array(values, dtype=np.int64)
+        except (OverflowError, TypeError, ValueError):
+            pass
+    return np.array(values, dtype=object)
+
+
+def _failing_with_numpy(keyed: list[Any], check: VectorCheck, cache: dict[Callable | None, Any]) -> list[int]:
+    if check.key not in cache:
+        cache[check.key] = _to_array(keyed)
+    return np.flatnonzero(check.fails(cache[check.key], check.bound)).tolist()
+
+
+def _failing(keyed: list[Any], check: VectorCheck) -> list[int]:
+    fails, bound = check.fails, check.bound
+    return [idx for idx, value in enumerate(keyed) if fails(value, bound)]
+
+
+def evaluate_vector_checks(checks: list[VectorCheck], values: list[Any]) -> dict[int, ValidationError]:
+    """
+    Errors of values by index. Every key function is applied to the column once,
+    comparisons are array operations, if numpy is installed and column is big enough.
+    The first failed check of value wins, as in row by row validation.
+    """
+    keyed_columns: dict[Callable | None, list[Any]] = {}
+    arrays: dict[Callable | None, Any] = {}
+    use_numpy = np is not None and len(values) >= settings.vectorize_validation_min_rows
+    errors: dict[int, ValidationError] = {}
+    for check in checks:
+        if check.key not in keyed_columns:
+            keyed_columns[check.key] = values if check.key is None else list(map(check.key, values))
+        keyed = keyed_columns[check.key]
+        failing = _failing_with_numpy(keyed, check, arrays) if use_numpy else _failing(keyed, check)
+        for idx in failing:
+            errors.setdefault(idx, check.error)
+    return errors
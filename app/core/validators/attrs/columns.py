@@ -1,9 +1,11 @@
-from typing import TypeVar, Type, Any, final, Generic
+from typing import TypeVar, Type, Any, Callable, final, Generic
 
+from core.constants import EMPTY
 from core.schema import COL_SCH
-from ._base import AttrValidator, ParentRepository, AttrValidatorParent
-from ._constraints import CONSTR_VAL, get_constraints_validator
-from ..exceptions import NotUnique, IncorrectFormat
+from ._base import AttrValidator, ParentRepository, AttrValidatorParent, UniqueScope
+from ._constraints import CONSTR_VAL, VectorCheck, get_constraints_validator
+from ._vectorized import evaluate_vector_checks
+from ..exceptions import NotUnique, IncorrectFormat, ValidationError, ListErrors
 
 __all__ = ["ColumnValidator", "get_column_validator"]
 
@@ -13,25 +15,138 @@ T = TypeVar('T', bound=Any)
 
 class ColumnValidator(AttrValidator[COL_SCH, T], Generic[COL_SCH, T, CONSTR_VAL]):
     _constr_validator_cls: Type[CONSTR_VAL]
+    _compilable = True
+    # checks, which list of values evaluates column-wise, and the rest of sync ones, which run row by row
+    _vector_checks: list[VectorCheck] = []
+    _row_checks: list[Callable[[Any, ParentRepository], Any]] = []
 
     def _post_init(self):
         self._constr_validator = get_constraints_validator(constraint=self.schema.constraints)
         for validator in self._constr_validator.get_validators():
             self.add_validator(validator)
-        if self.should_validate_unique():
-            self.add_validator(self._validate_unique)
+        # unique is checked separately from other validators, so list of values is checked by one query
+        self._unique = self.should_validate_unique()
+
+    def _on_validators_changed(self):
+        super()._on_validators_changed()
+        vector_forms = self._constr_validator.get_vector_checks()
+        self._vector_checks = [
+            check for val in self._validators for check in vector_forms.get(val.func, ())
+        ]
+        self._row_checks = [val.as_check() for val in self._validators if not val.coro and val.func not in vector_forms]
 
     @final
     async def validate(self, value: Any, repository: ParentRepository) -> T:
+        value = await self._validate_value(value=value, repository=repository)
+        if value is not None and self._unique:
+            await self._validate_unique(value=value, repository=repository)
+        return value
+
+    @property
+    def validates_unique(self) -> bool:
+        return self._unique
+
+    async def validate_value(self, value: Any, repository: ParentRepository) -> T | None:
+        """Validation without unique check, for callers, that check uniqueness in batch"""
+        return await self._validate_value(value=value, repository=repository)
+
+    async def validate_list(
+            self,
+            list_of_values: list,
+            repository: ParentRepository,
+            unique_scope: UniqueScope = None,
+    ) -> list[T]:
+        list_errors = ListErrors()
+        if self._vector_checks and not self.has_async_checks:
+            valid_list = self._validate_column(list_of_values, repository=repository, list_errors=list_errors)
+        else:
+            valid_list = await self._validate_rows(list_of_values, repository=repository, list_errors=list_errors)
+
+        to_check = [idx for idx, value in enumerate(valid_list) if value is not EMPTY and value is not None]
+        if self._unique and to_check:
+            flags = await repository.is_unique_many(
+                self.schema.name,
+                values=[valid_list[idx] for idx in to_check],
+                scope=None if unique_scope is None else unique_scope.subset(to_check),
+            )
+            for idx, is_unique in zip(to_check, flags):
+                if not is_unique:
+                    list_errors.add(idx=idx, err=NotUnique)
+        if list_errors:
+            raise list_errors
+        return valid_list
+
+    def _validate_column(self, list_of_values: list, repository: ParentRepository, list_errors: ListErrors) -> list:
+        """Values are transformed one by one, then constraint checks are evaluated over the whole column"""
+        valid_list = []
+        for idx, value in enumerate(list_of_values):
+            if value is not EMPTY:
+                try:
+                    value = self._transform_value(value)
+                except ValidationError as err:
+                    list_errors.add(idx=idx, err=err)
+                    value = EMPTY
+            valid_list.append(value)
+
+        to_check = [idx for idx, value in enumerate(valid_list) if value is not EMPTY and value is not None]
+        failed = evaluate_vector_checks(self._vector_checks, [valid_list[idx] for idx in to_check])
+        for pos, idx in enumerate(to_check):
+            error = failed.get(pos)
+            if error is None and self._row_checks:
+                try:
+                    for check in self._row_checks:
+                        check(valid_list[idx], repository)
+                except ValidationError as err:
+                    error = err
+            if error is not None:
+                list_errors.add(idx=idx, err=error)
+                valid_list[idx] = EMPTY
+        return valid_list
+
+    async def _validate_rows(self, list_of_values: list, repository: ParentRepository, list_errors: ListErrors) -> list:
+        valid_list = []
+        is_sync = not self.has_async_checks
+        for idx, value in enumerate(list_of_values):
+            if value is not EMPTY:
+                try:
+                    if is_sync:
+                        value = self._validate_value_sync(value=value, repository=repository)
+                    else:
+                        value = await self._validate_value(value=value, repository=repository)
+                except ValidationError as err:
+                    list_errors.add(idx=idx, err=err)
+                    value = EMPTY
+            valid_list.append(value)
+        return valid_list
+
+    def _transform_value(self, value: Any) -> T | None:
         try:
             value = self._constr_validator.transform(value=value)
         except Exception as e:
             raise IncorrectFormat(detail=str(e))
         if value is None:
             self.raise_if_non_nullable()
-            return
-        for validator in self._validators:
-            await validator(value=value, repository=repository)
+        return value
+
+    def _validate_value_sync(self, value: Any, repository: ParentRepository) -> T | None:
+        """Transform and checks, that don't need event loop"""
+        compiled = self.get_compiled()
+        if compiled is not None and not compiled.is_async:
+            return compiled.func(value, repository)
+        value = self._transform_value(value)
+        if value is not None:
+            self.run_sync_checks(value, repository)
+        return value
+
+    async def _validate_value(self, value: Any, repository: ParentRepository) -> T | None:
+        compiled = self.get_compiled()
+        if compiled is not None:
+            value = compiled.func(value, repository)
+            return await value if compiled.is_async else value
+        value = self._validate_value_sync(value=value, repository=repository)
+        if value is not None:
+            await self.run_async_checks(value, repository)
+        return value
 
     def is_available(self) -> bool:
         return not (self.schema.hidden or self.schema.read_only)
@@ -48,8 +163,7 @@ class ColumnValidator(AttrValidator[COL_SCH, T], Generic[COL_SCH, T, CONSTR_VAL]
     def should_validate_unique(self):
         if self.parent.is_list:
             return False
-        pks = self.parent.schema.primary_keys
-        return self.schema.unique or (len(pks) == 1 and pks[0] == self.schema.name)
+        return self.schema.unique or self.parent.schema.primary_key == self.schema.name
 
     async def _validate_unique(self, value: Any, repository: ParentRepository):
         if not await repository.is_unique(self.schema.name, value=value):
@@ -2,7 +2,7 @@ from typing import Any, TypeVar, Sequence, TYPE_CHECKING
 
 from core.constants import EMPTY
 from core.schema import COMP_SCH, OneOfCompositeSchema, Composites
-from ._base import AttrValidator, A_VAL, ParentRepository, AttrValidatorParent
+from ._base import AttrValidator, A_VAL, ParentRepository, AttrValidatorParent, UniqueScope
 from ..exceptions import ValidationError, IncorrectFormat, IncorrectAttr, ListErrors, NonNullable
 
 if TYPE_CHECKING:
@@ -39,7 +39,12 @@ class OneOfCompositeValidator(CompositeValidator[OneOfCompositeSchema, tuple[str
         except ValidationError as e:
             raise e(attr=attr_name)
 
-    async def validate_list(self, list_of_values: list, repository: LIST_REP) -> None:
+    async def validate_list(
+            self,
+            list_of_values: list,
+            repository: "LIST_REP",
+            unique_scope: UniqueScope = None,
+    ) -> None:
         real_attr_ids = {attr: [] for attr in self.schema.attrs}
         valid_values_lists = {}
         list_errors = ListErrors()
@@ -69,7 +74,9 @@ class OneOfCompositeValidator(CompositeValidator[OneOfCompositeSchema, tuple[str
                 continue
             try:
                 valid_attr_list_of_values = await self.get_attr(attr_name).validate_list(
-                    [list_of_values[i] for i in ids], repository=repository
+                    [list_of_values[i] for i in ids],
+                    repository=repository,
+                    unique_scope=None if unique_scope is None else unique_scope.subset(ids),
                 )
                 for idx, value in enumerate(valid_attr_list_of_values):
                     valid_values_lists[ids[idx]] = value
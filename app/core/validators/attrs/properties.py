@@ -13,10 +13,28 @@ class PropertyValidator(AttrValidator[PROP_SCH, Any]):
         if self.schema.setter_type is None:
             return
         self._constr_validator = get_constraints_validator(self.schema.setter_constraints)
+        self._compilable = True
         for validator in self._constr_validator.get_validators():
             self.add_validator(validator)
 
     async def validate(self, value: Any, repository: ParentRepository) -> Any:
+        compiled = self.get_compiled()
+        if compiled is not None:
+            value = compiled.func(value, repository)
+            return await value if compiled.is_async else value
+        value = self.validate_sync(value=value, repository=repository)
+        if value is not None:
+            await self.run_async_checks(value, repository)
+        return value
+
+    @property
+    def can_validate_sync(self) -> bool:
+        return not self.has_async_checks
+
+    def validate_sync(self, value: Any, repository: ParentRepository) -> Any:
+        compiled = self.get_compiled()
+        if compiled is not None and not compiled.is_async:
+            return compiled.func(value, repository)
         try:
             value = self._constr_validator.transform(value=value)
         except Exception as e:
@@ -24,8 +42,8 @@ class PropertyValidator(AttrValidator[PROP_SCH, Any]):
         if value is None:
             self.raise_if_non_nullable()
             return
-        for validator in self._validators:
-            await validator(value=value, repository=repository)
+        self.run_sync_checks(value, repository)
+        return value
 
     def modify_parent(self):
         if self.schema.setter_type is not None:
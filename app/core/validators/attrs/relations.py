@@ -2,7 +2,7 @@ from typing import Any, TYPE_CHECKING
 
 from core.constants import EMPTY
 from core.schema import REL_SCH, FWD_REL_SCH, REV_REL_SCH
-from ._base import AttrValidator, ParentRepository, AttrValidatorParent
+from ._base import AttrValidator, ParentRepository, AttrValidatorParent, UniqueScope
 from ..exceptions import NotFound, ListErrors
 
 if TYPE_CHECKING:
@@ -23,7 +23,7 @@ class ForwardRelationValidator(RelationValidator[FWD_REL_SCH]):
         self.local_attr = self.parent.get_column(self.schema.local_key)
 
     async def validate(self, value: Any, repository: ParentRepository):
-        value = self.local_attr.validate(value=value, repository=repository)
+        value = await self.local_attr.validate(value=value, repository=repository)
         if value is None:
             return
         value = await repository.related_repository(self.schema.name).get_one(value)
@@ -31,15 +31,22 @@ class ForwardRelationValidator(RelationValidator[FWD_REL_SCH]):
             raise NotFound
         return value
 
-    async def validate_list(self, list_of_values: list[Any], repository: LIST_REP) -> list[Any]:
-        valid_identifiers = self.local_attr.validate_list(list_of_values, repository=repository)
-        rel_objects: dict = await repository.related_repository(self.schema.name).get_many(
-            list(filter(lambda i: i is not EMPTY, valid_identifiers))
+    async def validate_list(
+            self,
+            list_of_values: list[Any],
+            repository: "LIST_REP",
+            unique_scope: UniqueScope = None,
+    ) -> list[Any]:
+        valid_identifiers = await self.local_attr.validate_list(
+            list_of_values, repository=repository, unique_scope=unique_scope
         )
+        identifiers = list({i for i in valid_identifiers if i is not EMPTY and i is not None})
+        rel_objects: dict = await repository.related_repository(self.schema.name).get_many(identifiers) \
+            if identifiers else {}
         validated = []
         list_errors = ListErrors()
         for idx, valid_id in enumerate(valid_identifiers):
-            if valid_id is EMPTY:
+            if valid_id is EMPTY or valid_id is None:
                 validated.append(valid_id)
             elif valid_id in rel_objects:
                 validated.append(rel_objects[valid_id])
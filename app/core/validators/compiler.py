@@ -0,0 +1,138 @@
+import linecache
+import re
+from itertools import count
+from typing import Any, Callable, NamedTuple
+
+from core.settings import settings
+from .attrs._base import AttrValidator, ValidatorFuncWrapper
+from .attrs._constraints import (
+    ConstraintValidator,
+    DateConstraintValidator, DateTimeConstraintValidator, IntegerConstraintValidator,
+    NumericConstraintValidator, StringConstraintValidator, TimeConstraintValidator,
+)
+from . import exceptions as err
+
+
+__all__ = ["CompiledFunc", "compile_value_validator", "is_compiling_enabled"]
+
+
+class CompiledFunc(NamedTuple):
+    func: Callable
+    is_async: bool
+    source: str
+
+
+InlineCheck = Callable[[ConstraintValidator, Callable[[Any], str]], str]
+
+_ids = count()
+
+
+def is_compiling_enabled() -> bool:
+    """Switch to interpretive validation, e.g. for debugging of validators"""
+    return settings.compile_validators
+
+
+def _compare(op: str, field: str, error: err.ValidationError, expr: str = 'value') -> InlineCheck:
+    def inline(cv: ConstraintValidator, ref: Callable[[Any], str]) -> str:
+        bound = ref(getattr(cv.constr, field))
+        return f'if {expr} {op} {bound}: raise {ref(error)}(value={bound})'
+    return inline
+
+
+# constraint checks, which are inlined into generated code; others are called as is
+_inline_checks: dict[Callable, InlineCheck] = {
+    DateConstraintValidator._validate_gte: _compare('<', 'gte', err.DateGteError),
+    DateConstraintValidator._validate_lte: _compare('>', 'lte', err.DateLteError),
+    DateTimeConstraintValidator._validate_gte: _compare('<', 'gte', err.DateTimeGteError),
+    DateTimeConstraintValidator._validate_lte: _compare('>', 'lte', err.DateTimeLteError),
+    DateTimeConstraintValidator._validate_naive:
+        lambda cv, ref: f'if value.tzinfo is not None: raise {ref(err.DateTimeTimezoneNaiveError)}',
+    DateTimeConstraintValidator._validate_aware:
+        lambda cv, ref: f'if value.tzinfo is None: raise {ref(err.DateTimeTimezoneAwareError)}',
+    IntegerConstraintValidator._validate_gte: _compare('<', 'gte', err.IntegerGteError),
+    IntegerConstraintValidator._validate_lte: _compare('>', 'lte', err.IntegerLteError),
+    NumericConstraintValidator._validate_gte: _compare('<', 'gte', err.NumericGteError),
+    NumericConstraintValidator._validate_lte: _compare('>', 'lte', err.NumericLteError),
+    NumericConstraintValidator._validate_gt: _compare('<=', 'gt', err.NumericGtError),
+    NumericConstraintValidator._validate_lt: _compare('>=', 'lt', err.NumericLtError),
+    StringConstraintValidator._validate_min_length:
+        _compare('<', 'min_length', err.StringMinLengthError, expr='len(value)'),
+    StringConstraintValidator._validate_max_length:
+        _compare('>', 'max_length', err.StringMaxLengthError, expr='len(value)'),
+    StringConstraintValidator._validate_pattern:
+        lambda cv, ref: f'if not {ref(cv.pattern.match)}(value): raise {ref(err.StringPatternError)}',
+    TimeConstraintValidator._validate_gte: _compare('<', 'gte', err.TimeGteError),
+    TimeConstraintValidator._validate_lte: _compare('>', 'lte', err.TimeLteError),
+}
+
+
+class _Namespace(dict):
+    """Globals of generated function. Every referenced object gets its own name"""
+
+    def ref(self, obj: Any) -> str:
+        for name, value in self.items():
+            if value is obj:
+                return name
+        name = f'_c{len(self)}'
+        self[name] = obj
+        return name
+
+
+def _exec(name: str, source: str, ns: _Namespace) -> Callable:
+    """Source is registered in linecache, so tracebacks through generated code are readable"""
+    filename = f'<compiled {name} {next(_ids)}>'
+    linecache.cache[filename] = (len(source), None, source.splitlines(keepends=True), filename)
+    exec(compile(source, filename, 'exec'), ns)
+    return ns[name]
+
+
+def _func_name(*parts: str) -> str:
+    return re.sub(r'\W', '_', '_'.join(parts))
+
+
+def _get_transform(cv: ConstraintValidator) -> Callable:
+    if type(cv).transform is ConstraintValidator.transform:
+        return cv._transform
+    return cv.transform
+
+
+def _call_source(wrapper: ValidatorFuncWrapper, ref: Callable[[Any], str]) -> tuple[str, bool]:
+    args = ('value', 'repository') if wrapper.as_is else [a for a in ('value', 'repository') if a in wrapper.args]
+    call = f'{ref(wrapper.func)}({", ".join(f"{a}={a}" for a in args)})'
+    return (f'await {call}', True) if wrapper.coro else (call, False)
+
+
+def compile_value_validator(attr_validator: AttrValidator) -> CompiledFunc:
+    """
+    Function (value, repository) -> valid value of column or property validator: transform, null check
+    and checks in order of validators. It is sync, if none of custom validators is coroutine.
+    """
+    cv: ConstraintValidator = attr_validator._constr_validator
+    ns = _Namespace(IncorrectFormat=err.IncorrectFormat, NonNullable=err.NonNullable)
+    body = [
+        'try:',
+        f'    value = {ns.ref(_get_transform(cv))}(value)',
+        'except Exception as e:',
+        '    raise IncorrectFormat(detail=str(e))',
+        'if value is None:',
+        '    return None' if attr_validator.is_nullable else '    raise NonNullable',
+    ]
+    is_async = False
+    for wrapper in attr_validator._validators:
+        func = getattr(wrapper.func, '__func__', wrapper.func)
+        inline = _inline_checks.get(func)
+        if inline is not None and getattr(wrapper.func, '__self__', cv) is cv:
+            body.append(inline(cv, ns.ref))
+        else:
+            line, coro = _call_source(wrapper, ns.ref)
+            body.append(line)
+            is_async = is_async or coro
+    body.append('return value')
+
+    name = _func_name('validate', attr_validator.schema.owner, attr_validator.schema.name)
+    source = '\n'.join([
+        f'{"async def" if is_async else "def"} {name}(value, repository):',
+        *(f'    {line}' for line in body),
+    ]) + '\n'
+    return CompiledFunc(func=_exec(name, source, ns), is_async=is_async, source=source)
+
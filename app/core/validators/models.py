@@ -1,13 +1,18 @@
-from typing import Generic, TypeVar
+from typing import Generic, TypeVar, Any, AsyncIterable, AsyncIterator, Iterable
 
+from core.constants import EMPTY
 from core.schema import M_SCH
+from core.settings import settings
+from core.utils import achunked
 from .attrs import (
     A_VAL,
     ColumnValidator, get_column_validator,
     RelationValidator, get_relation_validator,
     CompositeValidator, get_composite_validator,
-    PropertyValidator, get_property_validator
+    PropertyValidator, get_property_validator,
+    UniqueScope,
 )
+from .exceptions import ObjectErrors, ListErrors, UnexpectedAttr, RequiredAttr, ValidationError
 
 
 __all__ = ["ModelValidator", "M_VAL"]
@@ -57,6 +62,102 @@ class ModelValidator(Generic[M_SCH]):
     def get_composite(cls, name: str) -> CompositeValidator:
         return cls._composites[name]
 
+    async def _validate_attrs(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Data must contain only available attrs"""
+        errors = ObjectErrors()
+        valid_data = {}
+        for attr, value in data.items():
+            try:
+                valid_data[attr] = await self.get_available_attr(attr).validate(value, repository=self.repository)
+            except ValidationError as err:
+                errors.add(attr, err)
+        if errors:
+            raise errors
+        return valid_data
+
+    async def _validate_many(
+            self,
+            list_data: list[dict[str, Any]],
+            check_required: bool,
+            unique_scope: UniqueScope = None,
+    ) -> tuple[dict[str, Any], ...]:
+        """Rows are validated attr by attr, so every attr validator gets all values at once"""
+        list_errors = ListErrors()
+        all_attrs = {}
+        for idx, data in enumerate(list_data):
+            errors = ObjectErrors()
+            for attr in data:
+                all_attrs.setdefault(attr, None)
+                if attr not in self.available_attrs:
+                    errors.add(attr, UnexpectedAttr)
+            if check_required:
+                for attr in self.required_attrs:
+                    if attr not in data:
+                        errors.add(attr, RequiredAttr)
+            if errors:
+                list_errors.add(idx, err=errors)
+        if list_errors:
+            raise list_errors
+
+        valid_data = tuple(dict() for _ in range(len(list_data)))
+        for attr in all_attrs:
+            try:
+                valid_list_of_values = await self.get_available_attr(attr).validate_list(
+                    [data.get(attr, EMPTY) for data in list_data],
+                    repository=self.repository,
+                    unique_scope=unique_scope,
+                )
+                for i, value in enumerate(valid_list_of_values):
+                    if value is not EMPTY:
+                        valid_data[i][attr] = value
+            except ListErrors as errors:
+                for idx, err in errors:
+                    if idx not in list_errors:
+                        list_errors.add(idx, err=ObjectErrors())
+                    list_errors[idx].add(attr, err)
+        if list_errors:
+            raise list_errors
+        return valid_data
+
+    async def _validate_stream(
+            self,
+            rows: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+            check_required: bool,
+            chunk_size: int = None,
+            max_errors: int = None,
+            unique_scope: UniqueScope = None,
+    ) -> AsyncIterator[tuple[dict[str, Any], ...]]:
+        """
+        Rows are validated by chunks, so lookups are batched per chunk and only one chunk is kept in memory.
+        Chunks are yielded until the first error, after it rows are only validated to collect errors.
+        Errors (indexes of the whole stream) are raised at the end or as soon as max_errors rows failed.
+        """
+        chunk_size = chunk_size or settings.stream_validation_chunk_size
+        max_errors = max_errors or settings.stream_validation_max_errors
+        list_errors = ListErrors()
+        errors_count = 0
+        offset = 0
+        async for chunk in achunked(rows, chunk_size):
+            try:
+                valid_chunk = await self._validate_many(
+                    chunk,
+                    check_required=check_required,
+                    unique_scope=None if unique_scope is None else unique_scope.subset(
+                        range(offset, offset + len(chunk))
+                    ),
+                )
+                if not list_errors:
+                    yield valid_chunk
+            except ListErrors as errors:
+                for idx, err in errors:
+                    list_errors.add(offset + idx, err=err)
+                    errors_count += 1
+                    if errors_count >= max_errors:
+                        raise list_errors
+            offset += len(chunk)
+        if list_errors:
+            raise list_errors
+
     @classmethod
     def is_schema_bound(cls) -> bool:
         return getattr(cls, 'schema', None) is not None
@@ -64,7 +165,7 @@ class ModelValidator(Generic[M_SCH]):
     def __init_subclass__(cls, schema: M_SCH = None):
         if schema is None:
             return
-        assert cls.is_schema_bound()
+        assert not cls.is_schema_bound()
 
         cls.schema = schema
         cls._columns = {
@@ -1,9 +1,11 @@
-from typing import Any, TYPE_CHECKING, Type, TypeVar
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, TYPE_CHECKING, Type, TypeVar
 
 from core.schema import O_SCH, DIR_SCH, DOC_SCH
+from core.settings import settings
+from .attrs import ColumnValidator, ForwardRelationValidator, UniqueScope
 from .models import ModelValidator
 from .lists import ListValidator
-from .exceptions import ObjectErrors, UnexpectedAttr, RequiredAttr, ValidationError, ListErrors
+from .exceptions import ObjectErrors, UnexpectedAttr, RequiredAttr, ListErrors, ValidationError, NotUnique, NotFound
 
 if TYPE_CHECKING:
     from core.repositories import O_REP
@@ -30,11 +32,11 @@ class ObjectValidator(ModelValidator[O_SCH]):
         return self._lists[name](repository=self.repository.list_repository(name))
 
     async def validate(self, data: dict[str, Any]) -> dict[str, Any]:
-        create = self.repository.instance is not None
+        create = self.repository.instance is None
         errors = ObjectErrors()
 
         for attr in data:
-            if attr not in self.available_attrs or attr not in self._lists:
+            if attr not in self.available_attrs and attr not in self._lists:
                 errors.add(attr, UnexpectedAttr)
         if create:
             for attr in self.required_attrs:
@@ -46,14 +48,13 @@ class ObjectValidator(ModelValidator[O_SCH]):
         if errors:
             raise errors
 
-        valid_data = {}
+        try:
+            valid_data = await self._validate_attrs({k: v for k, v in data.items() if k in self.available_attrs})
+        except ObjectErrors as attr_errors:
+            valid_data = {}
+            errors.merge(attr_errors)
         for attr, value in data.items():
-            if attr in self.available_attrs:
-                try:
-                    valid_data[attr] = await self.get_available_attr(attr).validate(value, repository=self.repository)
-                except ValidationError as err:
-                    errors.add(attr, err)
-            else:
+            if attr in self._lists:
                 try:
                     valid_data[attr] = await self.get_list(attr).validate_list(value)
                 except ListErrors as err:
@@ -62,6 +63,87 @@ class ObjectValidator(ModelValidator[O_SCH]):
             raise errors
         return valid_data
 
+    async def _validate_attrs(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        With batch_validation_lookups pure checks of all attrs run first, then I/O checks are done in batch:
+        uniqueness of all attrs by one query and existence of related objects by one query per related repository.
+        """
+        if not settings.batch_validation_lookups:
+            return await super()._validate_attrs(data)
+        errors = ObjectErrors()
+        valid_data = {}
+        unique: dict[str, tuple[str, Any]] = {}  # unique attr -> (attr of data, value)
+        relations: dict[str, Any] = {}  # relation attr -> identifier
+        for attr, value in data.items():
+            validator = self.get_available_attr(attr)
+            try:
+                if isinstance(validator, ColumnValidator):
+                    value = await validator.validate_value(value, repository=self.repository)
+                    if value is not None and validator.validates_unique:
+                        unique[attr] = (attr, value)
+                elif isinstance(validator, ForwardRelationValidator):
+                    local_attr = validator.local_attr
+                    value = await local_attr.validate_value(value, repository=self.repository)
+                    if value is not None:
+                        if local_attr.validates_unique:
+                            unique[local_attr.schema.name] = (attr, value)
+                        relations[attr] = value
+                else:
+                    value = await validator.validate(value, repository=self.repository)
+                valid_data[attr] = value
+            except ValidationError as err:
+                errors.add(attr, err)
+
+        if unique:
+            flags = await self.repository.is_unique_attrs({name: value for name, (_, value) in unique.items()})
+            for name, is_unique in flags.items():
+                if not is_unique:
+                    attr = unique[name][0]
+                    errors.add(attr, NotUnique)
+                    valid_data.pop(attr, None)
+                    relations.pop(attr, None)
+
+        groups: dict[type, tuple[Any, dict[str, Any]]] = {}
+        for attr, identifier in relations.items():
+            related = self.repository.related_repository(attr)
+            groups.setdefault(type(related), (related, {}))[1][attr] = identifier
+        for related, identifiers in groups.values():
+            objects = await related.get_many(list(set(identifiers.values())))
+            for attr, identifier in identifiers.items():
+                if identifier in objects:
+                    valid_data[attr] = objects[identifier]
+                else:
+                    errors.add(attr, NotFound)
+                    valid_data.pop(attr, None)
+
+        if errors:
+            raise errors
+        return valid_data
+
+    async def validate_many(
+            self,
+            list_data: list[dict[str, Any]],
+            *,
+            create: bool = True,
+            unique_scope: UniqueScope = None,
+    ) -> list[dict[str, Any]]:
+        """Validation for bulk writes. Lists are not available here, they are written row by row"""
+        return list(await self._validate_many(list_data, check_required=create, unique_scope=unique_scope))
+
+    def validate_stream(
+            self,
+            rows: Iterable[dict[str, Any]] | AsyncIterable[dict[str, Any]],
+            *,
+            create: bool = True,
+            chunk_size: int = None,
+            max_errors: int = None,
+            unique_scope: UniqueScope = None,
+    ) -> AsyncIterator[tuple[dict[str, Any], ...]]:
+        """Validated chunks of rows for bulk loads, see ModelValidator._validate_stream"""
+        return self._validate_stream(
+            rows, check_required=create, chunk_size=chunk_size, max_errors=max_errors, unique_scope=unique_scope,
+        )
+
     def __init_subclass__(cls, schema: O_SCH = None):
         super().__init_subclass__(schema=schema)
         if schema is None:
@@ -1,9 +1,9 @@
-from core.repositories import DirectoryRepository
+from core.repositories.db import SaDirectoryRepository
 from .models import Employee
 
 
 __all__ = ["EmployeeRepository"]
 
 
-class EmployeeRepository(DirectoryRepository[Employee]):
+class EmployeeRepository(SaDirectoryRepository):
     model = Employee
@@ -1,33 +1,84 @@
-import re
+import asyncio
+from datetime import datetime, UTC
 from typing import Any
 
 from passlib.context import CryptContext
-from sqlalchemy import BinaryExpression, func
+from sqlalchemy import ColumnElement, func
 
-from core.db.models import OBJECT
-from core.repositories import DirectoryRepository
+from core.repositories.db import SaDirectoryRepository
+from core.settings import settings
+from core.utils import BoundedPool, get_pool
 from .models import User
 
 
 __all__ = ["UserRepository"]
 
 
-class UserRepository(DirectoryRepository[User]):
+class UserRepository(SaDirectoryRepository):
     model = User
 
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-    def _check_unique_whereclause(self, attr_name: str, value: Any) -> BinaryExpression[bool]:
+    def _unique_expression(self, attr_name: str) -> ColumnElement:
         if attr_name == 'username':
-            return func.lower(User.username) == value.lower()  # type: ignore
-        return super()._check_unique_whereclause(attr_name=attr_name, value=value)
+            return func.lower(User.username)
+        return super()._unique_expression(attr_name=attr_name)
+
+    def _unique_key(self, attr_name: str, value: Any) -> Any:
+        if attr_name == 'username':
+            return value.lower()
+        return super()._unique_key(attr_name=attr_name, value=value)
 
     async def create(self, data: dict[str, Any]) -> User:
         user: User = await super().create(data=data)
-        print(user.password)
-        self.set_password(user, user.password)
+        await self.set_password(user, user.password)
+        return user
+
+    async def _prepare_rows(self, list_data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        hashes = iter(await self.hash_passwords([data['password'] for data in list_data if 'password' in data]))
+        rows = []
+        for data in list_data:
+            row = self._prepare_row({k: v for k, v in data.items() if k != 'password'})
+            if 'password' in data:
+                row.update(password_hash=next(hashes), password_changed_at=datetime.now(UTC))
+            rows.append(row)
+        return rows
+
+    @classmethod
+    def get_password_pool(cls) -> BoundedPool:
+        """bcrypt takes ~100ms of CPU, so it runs in dedicated bounded pool instead of event loop"""
+        return get_pool(
+            'passwords',
+            max_workers=settings.password_hash_workers,
+            max_queue=settings.password_hash_max_queue,
+        )
+
+    @classmethod
+    async def hash_password(cls, password: str) -> str:
+        return await cls.get_password_pool().run(cls.pwd_context.hash, password)
+
+    @classmethod
+    async def hash_passwords(cls, passwords: list[str]) -> list[str]:
+        """Batch keeps at most max_workers calls in pool, so it never overflows queue however big it is"""
+        semaphore = asyncio.Semaphore(cls.get_password_pool().max_workers)
+
+        async def hash_password(password: str) -> str:
+            async with semaphore:
+                return await cls.hash_password(password)
+
+        return list(await asyncio.gather(*(hash_password(password) for password in passwords)))
+
+    @classmethod
+    async def verify_password(cls, user: User, password: str) -> bool:
+        """Hash of deprecated scheme is replaced, when password is correct"""
+        valid, new_hash = await cls.get_password_pool().run(
+            cls.pwd_context.verify_and_update, password, user.password_hash
+        )
+        if valid and new_hash is not None:
+            user.password_hash = new_hash
+        return valid
 
     @classmethod
-    def set_password(cls, user: User, password: str):
-        user.password_hash = cls.pwd_context.hash(password)
-        user.password_changed_at = datetime.now
+    async def set_password(cls, user: User, password: str) -> None:
+        user.password_hash = await cls.hash_password(password)
+        user.password_changed_at = datetime.now(UTC)
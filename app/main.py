@@ -1,8 +1,8 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 
 from core.db import init_models
 from core.settings import settings
-from core.schemas import get_app_schema
+from core.schema import create_default_app_schema, get_serialized_app_schema
 
 
 app = FastAPI(
@@ -12,10 +12,20 @@ app = FastAPI(
 
 
 @app.get('/app/schema')
-async def get_app_schema_route():
-    return get_app_schema()
+async def get_app_schema_route(request: Request):
+    serialized = get_serialized_app_schema()
+    encoding = serialized.choose_encoding(request.headers.get('accept-encoding'))
+    body, etag = serialized.get(encoding)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if serialized.etag_matches(etag, request.headers.get('if-none-match')):
+        return Response(status_code=304, headers=headers)
+    if encoding != 'identity':
+        headers['Content-Encoding'] = encoding
+    return Response(content=body, media_type='application/json', headers=headers)
 
 
 @app.on_event('startup')
 async def on_startup():
     init_models()
+    create_default_app_schema()
+    get_serialized_app_schema()
@@ -0,0 +1,23 @@
+import asyncio
+
+from passlib.context import CryptContext
+
+from core.db.models import get_base_metadata
+from core.utils import BoundedPool
+
+
+get_base_metadata(init_first=True)
+
+
+def test_hash_passwords_does_not_overload_pool(monkeypatch):
+    from directories.users.repository import UserRepository
+    pool = BoundedPool('test_passwords', max_workers=2, max_queue=3)
+    monkeypatch.setattr(UserRepository, 'get_password_pool', classmethod(lambda cls: pool))
+    monkeypatch.setattr(UserRepository, 'pwd_context', CryptContext(schemes=['hex_md5']))
+    passwords = [f'password{i}' for i in range(50)]
+
+    hashes = asyncio.run(UserRepository.hash_passwords(passwords))
+
+    assert [UserRepository.pwd_context.verify(p, h) for p, h in zip(passwords, hashes)] == [True] * 50
+    assert pool.stats.rejected == 0
+    assert pool.stats.max_queued <= pool.max_workers
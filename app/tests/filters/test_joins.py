@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from core.db.models import get_base_metadata
+from core.filters.processors.sqlalchemy import SaFilterProcessor
+from core.schema import AppSchema, ReverseForeignKeyRelationSchema
+from core.schema.app import AppInfo
+from core.schema_generators.db import model_schema_generators
+
+
+get_base_metadata(init_first=True)
+
+
+@pytest.fixture
+def app_schema() -> AppSchema:
+    from directories.users.models import User
+    from directories.employees.models import Employee
+    app_schema = AppSchema(info=AppInfo(version='test'))
+    for model in (User, Employee):
+        app_schema.add_directory(model_schema_generators.dispatch(model).schema())
+    app_schema.get_directory('users').attrs.append(ReverseForeignKeyRelationSchema(
+        name='employees',
+        owner='directories.users',
+        to_model='directories.employees',
+        local_key='id',
+        remote_key='user_id',
+    ))
+    return app_schema
+
+
+def _sql(app_schema: AppSchema, name: str, filters: dict) -> str:
+    processor = SaFilterProcessor(app_schema.get_directory(name), app_schema=app_schema)
+    plan = processor.compile_plan(None, filters)
+    query = plan.joins.apply(select(processor.model.id)).where(*plan.clauses)
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def test_forward_prefix_is_joined_once(app_schema):
+    sql = _sql(app_schema, 'employees', {'user.username': ['==', 'a'], 'user.role': ['==', 1], 'name': ['==', 'b']})
+    assert sql.count('LEFT OUTER JOIN directories.users AS "user"') == 1
+    assert sql.count('JOIN') == 1
+    assert '"user".username = ' in sql and '"user".role = ' in sql
+
+
+def test_and_group_shares_exists_per_reverse_relation(app_schema):
+    sql = _sql(app_schema, 'users', {
+        'employees.name': ['==', 'a'],
+        'employees.user_id': ['!=', None],
+        'username': ['==', 'b'],
+        '[not]': {'employees.name': ['==', 'c'], 'employees.user.username': ['==', 'd']},
+    })
+    assert sql.count('EXISTS') == 2
+    assert 'NOT (EXISTS' in sql
+    assert all(part.count('JOIN') <= 1 for part in sql.split('EXISTS'))
+    assert 'employees__user.username = ' in sql.split('NOT (EXISTS')[1]
+
+
+def test_or_group_wraps_clauses_one_by_one(app_schema):
+    sql = _sql(app_schema, 'users', {'[or]': {'employees.name': ['==', 'a'], 'employees.user_id': ['!=', None]}})
+    assert sql.count('EXISTS') == 2
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from core.repositories.db import SaListRepository
+
+
+def _repository(gap: int, rns: list[int] = None) -> SaListRepository:
+    model = type('Rows', (), {'__RN_GAP__': gap})
+    cls = type('RowsRepository', (SaListRepository,), {'model': model})
+    cls.__abstractmethods__ = frozenset()
+    repository = object.__new__(cls)
+    repository.stored = list(rns or [])
+
+    async def get_rns():
+        return sorted(repository.stored)
+
+    async def renumber(renumbering):
+        assert len(set(renumbering.values())) == len(renumbering)
+        repository.stored = [renumbering.get(rn, rn) for rn in repository.stored]
+
+    repository._get_rns = get_rns
+    repository._renumber = renumber
+    return repository
+
+
+def _insert(rns: list[int], idx: int, rn: int, renumbering: dict[int, int]) -> list[int]:
+    """Numbers in order of rows after insert of a row before rns[idx]"""
+    stored = [renumbering.get(old, old) for old in rns]
+    result = [*stored[:idx], rn, *stored[idx:]]
+    assert result == sorted(result) and len(set(result)) == len(result)
+    return result
+
+
+@pytest.mark.parametrize('idx', [0, 1, 3])
+def test_dense_insert_keeps_1_to_n(idx):
+    rns = [1, 2, 3]
+    rn, renumbering = _repository(gap=1)._make_room(rns, idx)
+    assert _insert(rns, idx, rn, renumbering) == [1, 2, 3, 4]
+    assert {old for old, new in renumbering.items() if old != new} == set(rns[idx:])
+
+
+def test_dense_insert_closes_holes():
+    rns = [1, 4, 9]
+    rn, renumbering = _repository(gap=1)._make_room(rns, 1)
+    assert _insert(rns, 1, rn, renumbering) == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize('idx, expected', [(0, 5), (1, 15), (2, 30)])
+def test_sparse_insert_takes_middle_of_gap(idx, expected):
+    rns = [10, 20]
+    assert _repository(gap=10)._make_room(rns, idx) == (expected, {})
+
+
+def test_sparse_insert_renumbers_when_gap_is_exhausted():
+    rns = [10, 11, 20]
+    rn, renumbering = _repository(gap=10)._make_room(rns, 1)
+    assert _insert(rns, 1, rn, renumbering) == [10, 20, 30, 40]
+
+
+@pytest.mark.parametrize('kept, expected', [
+    ([None, None], [1, 2]),
+    ([3, None, 1], [1, 2, 3]),
+])
+def test_dense_assign(kept, expected):
+    assert _repository(gap=1)._assign_rns(kept) == expected
+
+
+@pytest.mark.parametrize('kept, expected', [
+    ([None, 10, None, 20, None], [5, 10, 15, 20, 30]),
+    ([10, None, None, 40], [10, 20, 30, 40]),
+    ([10, None, 11], [10, 20, 30]),
+])
+def test_sparse_assign(kept, expected):
+    assert _repository(gap=10)._assign_rns(kept) == expected
+
+
+@pytest.mark.parametrize('position, to_position, order', [
+    (1, 3, ['b', 'c', 'a', 'd']),
+    (4, 2, ['a', 'd', 'b', 'c']),
+    (2, 1, ['b', 'a', 'c', 'd']),
+])
+@pytest.mark.parametrize('gap, rns', [(1, [1, 2, 3, 4]), (1, [1, 3, 4, 7]), (10, [10, 20, 21, 40])])
+def test_move_row(position, to_position, order, gap, rns):
+    repository = _repository(gap=gap, rns=rns)
+    rows = dict(zip(rns, 'abcd'))
+
+    asyncio.run(repository.move_row(position, to_position))
+
+    moved = {new: rows[old] for old, new in zip(rns, repository.stored)}
+    assert [moved[rn] for rn in sorted(moved)] == order
+    if gap == 1:
+        assert sorted(repository.stored) == [1, 2, 3, 4]
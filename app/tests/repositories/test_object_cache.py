@@ -0,0 +1,52 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from core.db.models import get_base_metadata
+from core.repositories.db.cache import ObjectCache, MemoryCacheBackend
+
+
+get_base_metadata(init_first=True)
+
+
+def _persistent_user(session: AsyncSession, **values):
+    from directories.users.models import User
+    user = User(**values)
+    make_transient_to_detached(user)
+    session.add(user)
+    return user
+
+
+def test_cache_hit_keeps_unflushed_changes():
+    from directories.users.models import User
+    cache = ObjectCache(model=User, backend=MemoryCacheBackend(maxsize=10, ttl=60))
+    session = AsyncSession()
+    pk = uuid4()
+    user = _persistent_user(session, id=pk, username='orig')
+    cache.set_many({pk: user})
+    user.username = 'local-change'
+
+    found, missing = asyncio.run(cache.get_many(session, [pk]))
+
+    assert missing == []
+    assert found[pk] is user
+    assert user.username == 'local-change'
+    assert user in session.dirty
+
+
+def test_cache_hit_restores_objects_not_held_by_session():
+    from directories.users.models import User
+    cache = ObjectCache(model=User, backend=MemoryCacheBackend(maxsize=10, ttl=60))
+    pk = uuid4()
+    cache.set_many({pk: _persistent_user(AsyncSession(), id=pk, username='cached')})
+    session = AsyncSession()
+
+    found, missing = asyncio.run(cache.get_many(session, [pk, uuid4()]))
+
+    assert len(missing) == 1
+    assert found[pk].username == 'cached'
+    assert found[pk] in session
+    assert found[pk] not in session.dirty
+    assert cache.stats.hits == 1
@@ -0,0 +1,21 @@
+from pathlib import Path
+
+from core.db.models import get_base_metadata
+from core.schema.snapshot import get_schema_key, get_snapshot_path
+from core.settings import BaseSettings
+
+
+get_base_metadata(init_first=True)
+
+
+def test_schema_key_depends_on_default_formats(monkeypatch):
+    key = get_schema_key()
+    monkeypatch.setattr(BaseSettings, 'default_date_fmt', '{YYYY}-{mm}-{dd}')
+    assert get_schema_key() != key
+
+
+def test_snapshot_path_does_not_depend_on_working_directory(monkeypatch, tmp_path):
+    path = get_snapshot_path()
+    monkeypatch.chdir(tmp_path)
+    assert get_snapshot_path() == path
+    assert path.parent == Path(__file__).resolve().parents[2]
@@ -0,0 +1,36 @@
+from sqlalchemy import Integer, String, column
+from sqlalchemy.dialects import postgresql
+
+from core.db.models import get_base_metadata
+from core.smart_queries.sqlalchemy import keyset_condition
+
+
+get_base_metadata(init_first=True)
+
+name = column('name', String)
+id_ = column('id', Integer)
+
+
+def _sql(descending: list[bool]) -> str:
+    condition = keyset_condition([name, id_], descending, ['b', 2])
+    return str(condition.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+
+
+def test_ascending_keys_use_row_comparison():
+    assert _sql([False, False]) == "(name, id) > ('b', 2)"
+
+
+def test_descending_keys_use_row_comparison():
+    assert _sql([True, True]) == "(name, id) < ('b', 2)"
+
+
+def test_mixed_directions_are_expanded():
+    assert _sql([False, True]) == "name > 'b' OR name = 'b' AND id < 2"
+    assert _sql([True, False]) == "name < 'b' OR name = 'b' AND id > 2"
+
+
+def test_mixed_directions_with_pk_tiebreaker():
+    role = column('role', Integer)
+    condition = keyset_condition([name, role, id_], [False, True, False], ['b', 1, 2])
+    sql = str(condition.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}))
+    assert sql == "name > 'b' OR name = 'b' AND role < 1 OR name = 'b' AND role = 1 AND id > 2"